@@ -0,0 +1,54 @@
+"""case-insensitive policy names (citext)
+
+Converts policy.name to CITEXT so its unique index, the ON CONFLICT insert
+and the rename check treat names differing only in case as the same.
+Refuses to run while such duplicates exist - the unique index rebuild
+would fail on them - and lists them so they can be renamed first.
+
+Revision ID: 2e9d5f1a7c63
+Revises: c4a0b7e25f18
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e9d5f1a7c63'
+down_revision: Union[str, None] = 'c4a0b7e25f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _name_type() -> str:
+    return op.get_bind().execute(sa.text(
+        "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = 'policy'::regclass AND attname = 'name'"
+    )).scalar()
+
+
+def upgrade() -> None:
+    # citext is a trusted extension: no superuser needed
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+    if _name_type() == "citext":
+        return  # Created by create_all with the new model
+
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT string_agg(name, ', ' ORDER BY name) FROM policy "
+        "GROUP BY lower(name) HAVING count(*) > 1"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Cannot make policy names case-insensitive: these policies differ "
+            "only in case - rename or delete all but one of each group, then "
+            "re-run the upgrade: " + "; ".join(duplicates)
+        )
+    op.execute("ALTER TABLE policy ALTER COLUMN name TYPE citext")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE policy ALTER COLUMN name TYPE VARCHAR")
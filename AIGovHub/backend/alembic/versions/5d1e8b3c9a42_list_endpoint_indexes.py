@@ -0,0 +1,44 @@
+"""list endpoint indexes
+
+Indexes on the filter and sort columns used by the list endpoints, the
+per-entity audit trail and the compliance report. IF NOT EXISTS keeps it
+safe on databases whose tables create_all already built with them.
+
+Revision ID: 5d1e8b3c9a42
+Revises: a3c9e1f47b20
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e8b3c9a42'
+down_revision: Union[str, None] = 'a3c9e1f47b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_model_risk", "modelregistry", ["risk_level"]),
+    ("ix_model_status", "modelregistry", ["compliance_status"]),
+    ("ix_version_model", "modelversion", ["model_id"]),
+    ("ix_log_entity", "compliancelog", ["entity_type", "entity_id", "timestamp"]),
+    ("ix_log_timestamp", "compliancelog", ["timestamp"]),
+    ("ix_policy_active_scope_created", "policy", ["is_active", "scope", "created_at"]),
+    ("ix_violation_model_created", "policyviolation", ["model_id", "created_at"]),
+    ("ix_violation_policy_created", "policyviolation", ["policy_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,49 @@
+"""cover id in ix_log_entity
+
+Rebuilds ix_log_entity with INCLUDE (id, action): the report now selects
+the log id as well, and the index-only scan needs it covered. Skipped when
+the index already includes both columns.
+
+Revision ID: 71b3a8e0d4f5
+Revises: 2e9d5f1a7c63
+Create Date: 2026-10-16 00:00:00
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '71b3a8e0d4f5'
+down_revision: Union[str, None] = '2e9d5f1a7c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOG_ENTITY_COLUMNS = ["entity_type", "entity_id", "timestamp"]
+
+
+def _included_columns(index_name: str) -> set:
+    indexdef = op.get_bind().execute(
+        sa.text("SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND indexname = :name"),
+        {"name": index_name},
+    ).scalar()
+    match = re.search(r"INCLUDE \(([^)]*)\)", indexdef or "")
+    return {c.strip().strip('"') for c in match.group(1).split(",")} if match else set()
+
+
+def _rebuild_log_entity(include: list) -> None:
+    op.drop_index("ix_log_entity", table_name="compliancelog", if_exists=True)
+    op.create_index("ix_log_entity", "compliancelog", LOG_ENTITY_COLUMNS, postgresql_include=include)
+
+
+def upgrade() -> None:
+    if not {"id", "action"} <= _included_columns("ix_log_entity"):
+        _rebuild_log_entity(["id", "action"])
+
+
+def downgrade() -> None:
+    _rebuild_log_entity(["action"])
@@ -0,0 +1,40 @@
+"""details GIN indexes
+
+jsonb_path_ops GIN indexes for containment queries (details @> ...) on
+audit log and policy violation details.
+
+Revision ID: 8f27c4d6e913
+Revises: 5d1e8b3c9a42
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f27c4d6e913'
+down_revision: Union[str, None] = '5d1e8b3c9a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_log_details_gin", "compliancelog"),
+    ("ix_violation_details_gin", "policyviolation"),
+]
+
+
+def upgrade() -> None:
+    for name, table in INDEXES:
+        op.create_index(
+            name, table, ["details"], if_not_exists=True,
+            postgresql_using="gin", postgresql_ops={"details": "jsonb_path_ops"}
+        )
+
+
+def downgrade() -> None:
+    for name, table in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,51 @@
+"""policy violation status columns
+
+Moves the attempted/current status of blocked status changes out of
+policyviolation.details into their own columns. Idempotent, so it is also
+safe on databases whose tables were created by create_all with the columns
+already present.
+
+Revision ID: a3c9e1f47b20
+Revises:
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e1f47b20'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # compliancestatus is the enum type create_all made for modelregistry
+    op.execute("ALTER TABLE policyviolation ADD COLUMN IF NOT EXISTS attempted_status compliancestatus")
+    op.execute("ALTER TABLE policyviolation ADD COLUMN IF NOT EXISTS current_status compliancestatus")
+    # Backfill from the old details keys, then drop them so each value has one home
+    op.execute("""
+        UPDATE policyviolation
+        SET attempted_status = (details->>'attempted_status')::compliancestatus,
+            current_status = (details->>'current_status')::compliancestatus,
+            details = details - 'attempted_status' - 'current_status'
+        WHERE details ?| array['attempted_status', 'current_status']
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        UPDATE policyviolation
+        SET details = COALESCE(details, '{}'::jsonb) || jsonb_strip_nulls(jsonb_build_object(
+            'attempted_status', attempted_status::text,
+            'current_status', current_status::text
+        ))
+        WHERE attempted_status IS NOT NULL OR current_status IS NOT NULL
+    """)
+    op.drop_column("policyviolation", "current_status")
+    op.drop_column("policyviolation", "attempted_status")
@@ -0,0 +1,54 @@
+"""metric version/timestamp index, cover action in ix_log_entity
+
+Adds ix_metric_version_ts and rebuilds ix_log_entity with INCLUDE (action)
+so the report's audit rows come from an index-only scan. The rebuild is
+skipped when the index already covers the column.
+
+Revision ID: c4a0b7e25f18
+Revises: 8f27c4d6e913
+Create Date: 2026-10-16 00:00:00
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a0b7e25f18'
+down_revision: Union[str, None] = '8f27c4d6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOG_ENTITY_COLUMNS = ["entity_type", "entity_id", "timestamp"]
+
+
+def _included_columns(index_name: str) -> set:
+    indexdef = op.get_bind().execute(
+        sa.text("SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND indexname = :name"),
+        {"name": index_name},
+    ).scalar()
+    match = re.search(r"INCLUDE \(([^)]*)\)", indexdef or "")
+    return {c.strip().strip('"') for c in match.group(1).split(",")} if match else set()
+
+
+def _rebuild_log_entity(include: list) -> None:
+    op.drop_index("ix_log_entity", table_name="compliancelog", if_exists=True)
+    op.create_index(
+        "ix_log_entity", "compliancelog", LOG_ENTITY_COLUMNS,
+        **({"postgresql_include": include} if include else {})
+    )
+
+
+def upgrade() -> None:
+    op.create_index("ix_metric_version_ts", "evaluationmetric", ["version_id", "timestamp"], if_not_exists=True)
+    if "action" not in _included_columns("ix_log_entity"):
+        _rebuild_log_entity(["action"])
+
+
+def downgrade() -> None:
+    _rebuild_log_entity([])
+    op.drop_index("ix_metric_version_ts", table_name="evaluationmetric", if_exists=True)
@@ -5,18 +5,22 @@ Provides endpoints for Gemini-based governance assistance.
 All endpoints are optional and gracefully degrade if AI is disabled.
 """
 
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from app.services.ai_governance import (
     assess_model_risk,
+    stream_model_risk,
     check_policy_compliance,
     suggest_description_improvements,
     is_ai_enabled,
     get_ai_config
 )
-from app.core.database import get_session
-from sqlmodel import Session, select
+from app.core.database import get_async_session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models import Policy
 import logging
 
@@ -68,11 +72,50 @@ class DescriptionImprovementResponse(BaseModel):
     ai_generated: bool = True
 
 
+class AnalyzeAllRequest(BaseModel):
+    model_name: str = Field(..., min_length=1, max_length=200)
+    description: str = Field(..., min_length=10, max_length=2000)
+    owner: str = Field(..., min_length=1, max_length=200)
+    risk_level: str = "unclassified"
+    compliance_status: str = "draft"
+
+
+class AnalyzeAllResponse(BaseModel):
+    risk: Optional[RiskAssessmentResponse]
+    compliance: Optional[ComplianceCheckResponse]
+    description: Optional[DescriptionImprovementResponse]
+
+
 class AIConfigResponse(BaseModel):
     enabled: bool
     model: Optional[str]
     cache_ttl: int
-    cache_size: int
+    cache_backend: str
+    cache_size: Optional[int]
+    semantic_cache: bool
+
+
+NO_POLICIES_RESULT = {
+    "compliant": True,
+    "concerns": [],
+    "required_actions": [],
+    "recommendations": ["No active policies to check against"],
+    "ai_generated": False
+}
+
+
+async def _active_policies(session: AsyncSession) -> List[Dict[str, Any]]:
+    """Fetch active policies as the dicts the AI service expects"""
+    statement = select(Policy).where(Policy.is_active == True)
+    return [
+        {
+            "name": p.name,
+            "description": p.description,
+            "scope": p.scope,
+            "is_active": p.is_active
+        }
+        for p in (await session.exec(statement)).all()
+    ]
 
 
 # Endpoints
@@ -111,7 +154,8 @@ async def assess_risk(request: RiskAssessmentRequest):
                 detail="AI risk assessment failed. Please try again or set risk manually."
             )
         
-        return RiskAssessmentResponse(**result)
+        # Result is already validated by the service - skip response re-validation
+        return ORJSONResponse({**result, "ai_generated": True})
         
     except Exception as e:
         logger.error(f"Risk assessment error: {e}")
@@ -121,10 +165,36 @@ async def assess_risk(request: RiskAssessmentRequest):
         )
 
 
+@router.post("/ai/assess-risk/stream")
+async def assess_risk_stream(request: RiskAssessmentRequest):
+    """
+    Streaming variant of /ai/assess-risk (application/x-ndjson).
+    
+    Yields {"delta": ...} lines with raw model text as it is generated, then
+    a final {"result": ...} line with the validated assessment, or
+    {"error": ...} if it could not be produced.
+    Returns 503 if AI features are disabled.
+    """
+    if not is_ai_enabled():
+        raise HTTPException(
+            status_code=503,
+            detail="AI features are not enabled. Set ENABLE_AI_FEATURES=true and provide GEMINI_API_KEY."
+        )
+    
+    return StreamingResponse(
+        stream_model_risk(
+            model_name=request.model_name,
+            description=request.description,
+            owner=request.owner
+        ),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.post("/ai/check-compliance", response_model=ComplianceCheckResponse)
 async def check_compliance(
     request: ComplianceCheckRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     AI-powered policy compliance check.
@@ -139,29 +209,10 @@ async def check_compliance(
         )
     
     try:
-        # Fetch active policies
-        statement = select(Policy).where(Policy.is_active == True)
-        policies = session.exec(statement).all()
+        policies_dict = await _active_policies(session)
         
-        if not policies:
-            return ComplianceCheckResponse(
-                compliant=True,
-                concerns=[],
-                required_actions=[],
-                recommendations=["No active policies to check against"],
-                ai_generated=False
-            )
-        
-        # Convert policies to dict
-        policies_dict = [
-            {
-                "name": p.name,
-                "description": p.description,
-                "scope": p.scope,
-                "is_active": p.is_active
-            }
-            for p in policies
-        ]
+        if not policies_dict:
+            return ORJSONResponse(NO_POLICIES_RESULT)
         
         model_data = {
             "name": request.model_name,
@@ -178,7 +229,7 @@ async def check_compliance(
                 detail="AI compliance check failed. Please review policies manually."
             )
         
-        return ComplianceCheckResponse(**result)
+        return ORJSONResponse({**result, "ai_generated": True})
         
     except HTTPException:
         raise
@@ -213,7 +264,7 @@ async def improve_description(request: DescriptionImprovementRequest):
                 detail="AI description analysis failed."
             )
         
-        return DescriptionImprovementResponse(**result)
+        return ORJSONResponse({**result, "ai_generated": True})
         
     except HTTPException:
         raise
@@ -223,3 +274,52 @@ async def improve_description(request: DescriptionImprovementRequest):
             status_code=500,
             detail=f"Description analysis failed: {str(e)}"
         )
+
+
+@router.post("/ai/analyze-all", response_model=AnalyzeAllResponse)
+async def analyze_all(
+    request: AnalyzeAllRequest,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Risk assessment, compliance check and description review in one call.
+    
+    The three Gemini requests run concurrently, so latency is that of the
+    slowest one rather than their sum. A section that fails is returned as
+    null instead of failing the whole response.
+    Returns 503 if AI features are disabled.
+    """
+    if not is_ai_enabled():
+        raise HTTPException(
+            status_code=503,
+            detail="AI features are not enabled."
+        )
+    
+    policies_dict = await _active_policies(session)
+    model_data = {
+        "name": request.model_name,
+        "description": request.description,
+        "risk_level": request.risk_level,
+        "compliance_status": request.compliance_status
+    }
+    
+    risk, compliance, description = await asyncio.gather(
+        assess_model_risk(
+            model_name=request.model_name,
+            description=request.description,
+            owner=request.owner
+        ),
+        check_policy_compliance(model_data, policies_dict),
+        suggest_description_improvements(request.description),
+    )
+    
+    if not policies_dict:
+        compliance = NO_POLICIES_RESULT
+    elif compliance is not None:
+        compliance = {**compliance, "ai_generated": True}
+    
+    return ORJSONResponse({
+        "risk": {**risk, "ai_generated": True} if risk is not None else None,
+        "compliance": compliance,
+        "description": {**description, "ai_generated": True} if description is not None else None,
+    })
@@ -5,47 +5,47 @@ from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
-from ..core.database import get_session
+from ..core.database import get_session, SessionManager
 from ..core.auth import (
     User, UserCreate, UserRead, Token,
-    authenticate_user, create_access_token, get_password_hash,
-    ACCESS_TOKEN_EXPIRE_MINUTES, get_user
+    authenticate_user_async, create_access_token, get_password_hash,
+    ACCESS_TOKEN_EXPIRE_MINUTES, username_exists_async
 )
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserRead)
-def register(user_data: UserCreate, session: Session = Depends(get_session)):
+async def register(user_data: UserCreate):
     """Register a new user"""
-    # Check if user exists
-    existing = get_user(session, user_data.username)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered"
-        )
+    # Hash before taking a connection so bcrypt time doesn't pin one
+    hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
     
-    # Create user
-    user = User(
-        username=user_data.username,
-        email=user_data.email,
-        hashed_password=get_password_hash(user_data.password)
-    )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
+    async with SessionManager() as session:
+        # Check if user exists
+        if await username_exists_async(session, user_data.username):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already registered"
+            )
+        
+        # Create user
+        user = User(
+            username=user_data.username,
+            email=user_data.email,
+            hashed_password=hashed_password
+        )
+        session.add(user)
+        await session.commit()
     return user
 
 
 @router.post("/token", response_model=Token)
-def login(
-    form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session)
-):
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Login and get access token"""
-    user = authenticate_user(session, form_data.username, form_data.password)
+    user = await authenticate_user_async(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -3,12 +3,13 @@ Lineage API routes.
 CRUD for datasets and model dependencies/lineage tracking.
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 
-from ..core.database import get_session
+from ..core.database import get_async_session
 from ..models import (
     Dataset, ModelDatasetLink, ModelDependency,
     DatasetType, DependencyType, ModelRegistry
@@ -42,8 +43,7 @@ class DatasetRead(BaseModel):
     record_count: Optional[int]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DatasetLinkCreate(BaseModel):
@@ -62,8 +62,7 @@ class DatasetLinkRead(BaseModel):
     notes: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DependencyCreate(BaseModel):
@@ -83,8 +82,7 @@ class DependencyRead(BaseModel):
     notes: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class LineageResponse(BaseModel):
@@ -95,18 +93,17 @@ class LineageResponse(BaseModel):
 
 # --- Dataset CRUD ---
 @router.post("/datasets/", response_model=DatasetRead)
-def create_dataset(payload: DatasetCreate, session: Session = Depends(get_session)):
+async def create_dataset(payload: DatasetCreate, session: AsyncSession = Depends(get_async_session)):
     """Create a new dataset for lineage tracking"""
     dataset = Dataset(**payload.model_dump())
     session.add(dataset)
-    session.commit()
-    session.refresh(dataset)
+    await session.commit()
     return dataset
 
 
 @router.get("/datasets/", response_model=List[DatasetRead])
-def list_datasets(
-    session: Session = Depends(get_session),
+async def list_datasets(
+    session: AsyncSession = Depends(get_async_session),
     organization_id: Optional[int] = Query(None),
     data_sensitivity: Optional[str] = Query(None)
 ):
@@ -116,13 +113,13 @@ def list_datasets(
         query = query.where(Dataset.organization_id == organization_id)
     if data_sensitivity:
         query = query.where(Dataset.data_sensitivity == data_sensitivity)
-    return session.exec(query.order_by(Dataset.created_at.desc())).all()
+    return (await session.exec(query.order_by(Dataset.created_at.desc()))).all()
 
 
 @router.get("/datasets/{dataset_id}", response_model=DatasetRead)
-def get_dataset(dataset_id: int, session: Session = Depends(get_session)):
+async def get_dataset(dataset_id: int, session: AsyncSession = Depends(get_async_session)):
     """Get a specific dataset"""
-    dataset = session.get(Dataset, dataset_id)
+    dataset = await session.get(Dataset, dataset_id)
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
     return dataset
@@ -130,17 +127,17 @@ def get_dataset(dataset_id: int, session: Session = Depends(get_session)):
 
 # --- Model-Dataset Links ---
 @router.post("/models/{model_id}/datasets/", response_model=DatasetLinkRead)
-def link_dataset_to_model(
+async def link_dataset_to_model(
     model_id: int,
     payload: DatasetLinkCreate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Link a dataset to a model"""
-    model = session.get(ModelRegistry, model_id)
+    model = await session.get(ModelRegistry, model_id)
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
     
-    dataset = session.get(Dataset, payload.dataset_id)
+    dataset = await session.get(Dataset, payload.dataset_id)
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
     
@@ -152,32 +149,31 @@ def link_dataset_to_model(
         notes=payload.notes
     )
     session.add(link)
-    session.commit()
-    session.refresh(link)
+    await session.commit()
     return link
 
 
 @router.get("/models/{model_id}/datasets/", response_model=List[DatasetLinkRead])
-def get_model_datasets(model_id: int, session: Session = Depends(get_session)):
+async def get_model_datasets(model_id: int, session: AsyncSession = Depends(get_async_session)):
     """Get all datasets linked to a model"""
-    return session.exec(
+    return (await session.exec(
         select(ModelDatasetLink).where(ModelDatasetLink.model_id == model_id)
-    ).all()
+    )).all()
 
 
 # --- Model Dependencies ---
 @router.post("/models/{model_id}/dependencies/", response_model=DependencyRead)
-def create_dependency(
+async def create_dependency(
     model_id: int,
     payload: DependencyCreate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Declare a model dependency (this model depends on parent_model)"""
-    model = session.get(ModelRegistry, model_id)
+    model = await session.get(ModelRegistry, model_id)
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
     
-    parent = session.get(ModelRegistry, payload.parent_model_id)
+    parent = await session.get(ModelRegistry, payload.parent_model_id)
     if not parent:
         raise HTTPException(status_code=404, detail="Parent model not found")
     
@@ -189,33 +185,32 @@ def create_dependency(
         notes=payload.notes
     )
     session.add(dependency)
-    session.commit()
-    session.refresh(dependency)
+    await session.commit()
     return dependency
 
 
 # --- Full Lineage ---
 @router.get("/models/{model_id}/lineage", response_model=LineageResponse)
-def get_model_lineage(model_id: int, session: Session = Depends(get_session)):
+async def get_model_lineage(model_id: int, session: AsyncSession = Depends(get_async_session)):
     """Get full lineage for a model (datasets + parent/child models)"""
-    model = session.get(ModelRegistry, model_id)
+    model = await session.get(ModelRegistry, model_id)
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
     
     # Get linked datasets
-    datasets = session.exec(
+    datasets = (await session.exec(
         select(ModelDatasetLink).where(ModelDatasetLink.model_id == model_id)
-    ).all()
+    )).all()
     
     # Get parent models (this model depends on)
-    parents = session.exec(
+    parents = (await session.exec(
         select(ModelDependency).where(ModelDependency.child_model_id == model_id)
-    ).all()
+    )).all()
     
     # Get child models (depend on this model)
-    children = session.exec(
+    children = (await session.exec(
         select(ModelDependency).where(ModelDependency.parent_model_id == model_id)
-    ).all()
+    )).all()
     
     return LineageResponse(
         datasets=list(datasets),
@@ -2,47 +2,98 @@
 Observability metrics endpoint.
 Provides Prometheus-compatible metrics for monitoring.
 """
-from fastapi import APIRouter
+import time
+import asyncio
+from typing import Any, Dict, Set
+from fastapi import APIRouter, Response
 from fastapi.responses import PlainTextResponse
-from sqlmodel import Session, select, func
-from ..core.database import engine
-from ..models import ModelRegistry, ModelVersion, Policy, PolicyViolation, ComplianceLog
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ..core.database import async_session
+from ..models import (
+    ModelRegistry, ModelVersion, Policy, PolicyViolation, ComplianceLog,
+    RiskLevel, ComplianceStatus
+)
 
 router = APIRouter(tags=["Observability"])
 
+# Counts change on human timescales - serve a cached rendering for a short TTL,
+# and past it keep serving the stale body while one background refresh runs.
+METRICS_CACHE_TTL_SECONDS = 10
+METRICS_MAX_STALE_SECONDS = 60
+# Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_metrics_cache: Dict[str, Any] = {"body": None, "expires": 0.0, "lock": asyncio.Lock()}
+_refresh_tasks: Set[asyncio.Task] = set()
+
 
 @router.get("/metrics", response_class=PlainTextResponse)
-def prometheus_metrics():
+async def prometheus_metrics():
     """
     Prometheus-compatible metrics endpoint.
     Exposes key governance metrics for monitoring dashboards.
     """
+    body = _metrics_cache["body"]
+    now = time.monotonic()
+    if body is not None and now < _metrics_cache["expires"]:
+        return Response(content=body, media_type=METRICS_CONTENT_TYPE)
+    
+    if body is not None and now < _metrics_cache["expires"] + METRICS_MAX_STALE_SECONDS:
+        # Stale-while-revalidate: answer now, refresh once in the background
+        if not _metrics_cache["lock"].locked():
+            task = asyncio.create_task(_refresh_metrics())
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+        return Response(content=body, media_type=METRICS_CONTENT_TYPE)
+    
+    return Response(content=await _refresh_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+async def _refresh_metrics() -> bytes:
+    """Recompute the metrics body; concurrent callers share one DB pass"""
+    async with _metrics_cache["lock"]:
+        if _metrics_cache["body"] is not None and time.monotonic() < _metrics_cache["expires"]:
+            return _metrics_cache["body"]
+        async with async_session() as session:
+            # Cached pre-encoded so scrapes within the TTL do no work at all
+            body = (await _render_metrics(session)).encode()
+        _metrics_cache["body"] = body
+        _metrics_cache["expires"] = time.monotonic() + METRICS_CACHE_TTL_SECONDS
+        return body
+
+
+async def _render_metrics(session: AsyncSession) -> str:
+    """Query governance counts and render them in Prometheus text format"""
     metrics = []
     
-    with Session(engine) as session:
-        # Model counts
-        total_models = session.exec(select(func.count(ModelRegistry.id))).one()
-        total_versions = session.exec(select(func.count(ModelVersion.id))).one()
-        total_policies = session.exec(select(func.count(Policy.id))).one()
-        active_policies = session.exec(
-            select(func.count(Policy.id)).where(Policy.is_active == True)
-        ).one()
-        total_violations = session.exec(select(func.count(PolicyViolation.id))).one()
-        total_audit_logs = session.exec(select(func.count(ComplianceLog.id))).one()
-        
-        # Count by risk level
-        for risk in ['unclassified', 'minimal', 'limited', 'high', 'unacceptable']:
-            count = session.exec(
-                select(func.count(ModelRegistry.id)).where(ModelRegistry.risk_level == risk)
-            ).one()
-            metrics.append(f'ai_governance_models_by_risk{{risk_level="{risk}"}} {count}')
-        
-        # Count by compliance status
-        for status in ['draft', 'under_review', 'approved', 'retired']:
-            count = session.exec(
-                select(func.count(ModelRegistry.id)).where(ModelRegistry.compliance_status == status)
-            ).one()
-            metrics.append(f'ai_governance_models_by_status{{status="{status}"}} {count}')
+    # Totals in a single round-trip via scalar subqueries
+    (
+        total_models, total_versions, total_policies,
+        active_policies, total_violations, total_audit_logs
+    ) = (await session.exec(select(
+        select(func.count()).select_from(ModelRegistry).scalar_subquery(),
+        select(func.count()).select_from(ModelVersion).scalar_subquery(),
+        select(func.count()).select_from(Policy).scalar_subquery(),
+        select(func.count()).select_from(Policy).where(Policy.is_active == True).scalar_subquery(),
+        select(func.count()).select_from(PolicyViolation).scalar_subquery(),
+        select(func.count()).select_from(ComplianceLog).scalar_subquery(),
+    ))).one()
+    
+    # Count by risk level / compliance status with one GROUP BY each
+    by_risk = dict((await session.exec(
+        select(ModelRegistry.risk_level, func.count())
+        .group_by(ModelRegistry.risk_level)
+    )).all())
+    by_status = dict((await session.exec(
+        select(ModelRegistry.compliance_status, func.count())
+        .group_by(ModelRegistry.compliance_status)
+    )).all())
+    
+    for risk in RiskLevel:
+        metrics.append(f'ai_governance_models_by_risk{{risk_level="{risk.value}"}} {by_risk.get(risk, 0)}')
+    
+    for status in ComplianceStatus:
+        metrics.append(f'ai_governance_models_by_status{{status="{status.value}"}} {by_status.get(status, 0)}')
     
     # Build metrics output
     metrics = [
@@ -72,4 +123,5 @@ def prometheus_metrics():
         "",
     ] + metrics
     
-    return "\n".join(metrics)
+    # The exposition format requires every line, including the last, to end in \n
+    return "\n".join(metrics) + "\n"
@@ -2,13 +2,17 @@
 Organization API routes.
 CRUD operations for organizations.
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import exists
+from sqlalchemy.dialects.postgresql import insert
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 
-from ..core.database import get_session
+from ..core.database import get_async_session
+from ..core.cache import cache, invalidate, ORGANIZATIONS_NAMESPACE
 from ..models import Organization
 
 
@@ -30,8 +34,7 @@ class OrganizationRead(BaseModel):
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrganizationUpdate(BaseModel):
@@ -43,50 +46,65 @@ class OrganizationUpdate(BaseModel):
 
 # --- Organization CRUD ---
 @router.post("/", response_model=OrganizationRead)
-def create_organization(payload: OrganizationCreate, session: Session = Depends(get_session)):
+async def create_organization(payload: OrganizationCreate, session: AsyncSession = Depends(get_async_session)):
     """Create a new organization (admin only)"""
-    existing = session.exec(select(Organization).where(Organization.name == payload.name)).first()
-    if existing:
+    # Single atomic insert; a duplicate name returns no row
+    values = Organization(**payload.model_dump()).model_dump(exclude={"id"})
+    org = (await session.execute(
+        insert(Organization).values(**values)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Organization)
+    )).scalar_one_or_none()
+    if org is None:
         raise HTTPException(status_code=400, detail="Organization with this name already exists")
     
-    org = Organization(**payload.model_dump())
-    session.add(org)
-    session.commit()
-    session.refresh(org)
+    await session.commit()
+    await invalidate(ORGANIZATIONS_NAMESPACE)
     return org
 
 
 @router.get("/", response_model=List[OrganizationRead])
-def list_organizations(session: Session = Depends(get_session)):
-    """List all organizations"""
-    return session.exec(select(Organization).order_by(Organization.name)).all()
+@cache(expire=60, namespace=ORGANIZATIONS_NAMESPACE)
+async def list_organizations(
+    session: AsyncSession = Depends(get_async_session),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
+    """List organizations by name, paginated by limit/offset"""
+    return (await session.exec(
+        select(Organization).order_by(Organization.name).offset(offset).limit(limit)
+    )).all()
 
 
 @router.get("/{org_id}", response_model=OrganizationRead)
-def get_organization(org_id: int, session: Session = Depends(get_session)):
+async def get_organization(org_id: int, session: AsyncSession = Depends(get_async_session)):
     """Get a specific organization by ID"""
-    org = session.get(Organization, org_id)
+    org = await session.get(Organization, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
     return org
 
 
 @router.patch("/{org_id}", response_model=OrganizationRead)
-def update_organization(
+async def update_organization(
     org_id: int,
     payload: OrganizationUpdate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update an organization (admin only)"""
-    org = session.get(Organization, org_id)
+    org = await session.get(Organization, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
     
     update_data = payload.model_dump(exclude_unset=True)
+    if "name" in update_data and await session.scalar(select(exists().where(
+        Organization.name == update_data["name"], Organization.id != org_id
+    ))):
+        raise HTTPException(status_code=400, detail="Organization with this name already exists")
     for key, value in update_data.items():
         setattr(org, key, value)
     
     session.add(org)
-    session.commit()
-    session.refresh(org)
+    await session.commit()
+    await invalidate(ORGANIZATIONS_NAMESPACE)
     return org
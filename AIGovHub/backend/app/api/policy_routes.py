@@ -3,13 +3,20 @@ Policy API routes.
 CRUD operations for governance policies and policy violations.
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from fastapi.responses import ORJSONResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import exists
+from sqlalchemy.dialects.postgresql import insert
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 
-from ..core.database import get_session
-from ..models import Policy, PolicyViolation, PolicyScope, PolicyConditionType
+from ..core.database import get_async_session, list_query_options
+from ..core.policy_engine import invalidate_policy_cache
+from ..core.cache import cache, invalidate, POLICIES_NAMESPACE
+from ..core.timeutils import utcnow
+from ..models import Policy, PolicyViolation, PolicyScope, PolicyConditionType, ComplianceStatus
 
 
 router = APIRouter(prefix="/policies", tags=["Policies"])
@@ -38,8 +45,7 @@ class PolicyRead(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PolicyUpdate(BaseModel):
@@ -57,103 +63,155 @@ class PolicyViolationRead(BaseModel):
     model_version_id: Optional[int]
     user_id: Optional[int]
     action: str
+    attempted_status: Optional[ComplianceStatus]
+    current_status: Optional[ComplianceStatus]
     details: Optional[dict]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PolicyViolationSummary(BaseModel):
+    """Compact violation row for list views (no details JSON)"""
+    id: int
+    policy_id: int
+    policy_name: str
+    model_id: Optional[int]
+    action: str
+    attempted_status: Optional[ComplianceStatus]
+    current_status: Optional[ComplianceStatus]
+    created_at: datetime
 
 
 # --- Policy CRUD ---
 @router.post("/", response_model=PolicyRead)
-def create_policy(payload: PolicyCreate, session: Session = Depends(get_session)):
+async def create_policy(payload: PolicyCreate, session: AsyncSession = Depends(get_async_session)):
     """Create a new governance policy (admin only)"""
-    # Check for duplicate name
-    existing = session.exec(select(Policy).where(Policy.name == payload.name)).first()
-    if existing:
+    # Single atomic insert; a duplicate name returns no row
+    values = Policy(**payload.model_dump()).model_dump(exclude={"id"})
+    policy = (await session.execute(
+        insert(Policy).values(**values)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Policy)
+    )).scalar_one_or_none()
+    if policy is None:
         raise HTTPException(status_code=400, detail="Policy with this name already exists")
     
-    policy = Policy(**payload.model_dump())
-    session.add(policy)
-    session.commit()
-    session.refresh(policy)
+    await session.commit()
+    invalidate_policy_cache()
+    await invalidate(POLICIES_NAMESPACE)
     return policy
 
 
 @router.get("/", response_model=List[PolicyRead])
-def list_policies(
-    session: Session = Depends(get_session),
+@cache(expire=30, namespace=POLICIES_NAMESPACE)
+async def list_policies(
+    session: AsyncSession = Depends(get_async_session),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     scope: Optional[PolicyScope] = Query(None, description="Filter by scope")
 ):
     """List all policies with optional filters"""
-    query = select(Policy)
+    query = select(Policy).options(*list_query_options())
     if is_active is not None:
         query = query.where(Policy.is_active == is_active)
     if scope:
         query = query.where(Policy.scope == scope)
-    return session.exec(query.order_by(Policy.created_at.desc())).all()
+    return (await session.exec(query.order_by(Policy.created_at.desc()))).all()
 
 
 @router.get("/{policy_id}", response_model=PolicyRead)
-def get_policy(policy_id: int, session: Session = Depends(get_session)):
+async def get_policy(policy_id: int, session: AsyncSession = Depends(get_async_session)):
     """Get a specific policy by ID"""
-    policy = session.get(Policy, policy_id)
+    policy = await session.get(Policy, policy_id)
     if not policy:
         raise HTTPException(status_code=404, detail="Policy not found")
     return policy
 
 
 @router.patch("/{policy_id}", response_model=PolicyRead)
-def update_policy(
+async def update_policy(
     policy_id: int,
     payload: PolicyUpdate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update a policy (admin only)"""
-    policy = session.get(Policy, policy_id)
+    policy = await session.get(Policy, policy_id)
     if not policy:
         raise HTTPException(status_code=404, detail="Policy not found")
     
     update_data = payload.model_dump(exclude_unset=True)
+    if "name" in update_data and await session.scalar(select(exists().where(
+        Policy.name == update_data["name"], Policy.id != policy_id
+    ))):
+        raise HTTPException(status_code=400, detail="Policy with this name already exists")
     for key, value in update_data.items():
         setattr(policy, key, value)
-    policy.updated_at = datetime.utcnow()
+    policy.updated_at = utcnow()
     
     session.add(policy)
-    session.commit()
-    session.refresh(policy)
+    await session.commit()
+    invalidate_policy_cache()
+    await invalidate(POLICIES_NAMESPACE)
     return policy
 
 
 @router.delete("/{policy_id}")
-def delete_policy(policy_id: int, session: Session = Depends(get_session)):
+async def delete_policy(policy_id: int, session: AsyncSession = Depends(get_async_session)):
     """Delete a policy (admin only) - soft delete by deactivating"""
-    policy = session.get(Policy, policy_id)
+    policy = await session.get(Policy, policy_id)
     if not policy:
         raise HTTPException(status_code=404, detail="Policy not found")
     
     policy.is_active = False
-    policy.updated_at = datetime.utcnow()
+    policy.updated_at = utcnow()
     session.add(policy)
-    session.commit()
+    await session.commit()
+    invalidate_policy_cache()
+    await invalidate(POLICIES_NAMESPACE)
     return {"message": "Policy deactivated"}
 
 
 # --- Policy Violations ---
-@router.get("/violations/", response_model=List[PolicyViolationRead])
-def list_policy_violations(
-    session: Session = Depends(get_session),
+@router.get(
+    "/violations/",
+    response_model=None,
+    responses={200: {"model": List[PolicyViolationSummary]}}
+)
+async def list_policy_violations(
+    session: AsyncSession = Depends(get_async_session),
     model_id: Optional[int] = Query(None, description="Filter by model"),
     policy_id: Optional[int] = Query(None, description="Filter by policy"),
     limit: int = Query(100, le=500)
 ):
-    """List policy violations with optional filters"""
-    query = select(PolicyViolation)
+    """List policy violations with optional filters (summary columns only)"""
+    # Select just the listed columns - the details JSON is only fetched per
+    # violation via GET /violations/{id}
+    query = select(
+        PolicyViolation.id,
+        PolicyViolation.policy_id,
+        Policy.name.label("policy_name"),
+        PolicyViolation.model_id,
+        PolicyViolation.action,
+        PolicyViolation.attempted_status,
+        PolicyViolation.current_status,
+        PolicyViolation.created_at,
+    ).join(Policy, Policy.id == PolicyViolation.policy_id)
     if model_id:
         query = query.where(PolicyViolation.model_id == model_id)
     if policy_id:
         query = query.where(PolicyViolation.policy_id == policy_id)
-    return session.exec(
+    rows = (await session.exec(
         query.order_by(PolicyViolation.created_at.desc()).limit(limit)
-    ).all()
+    )).all()
+    # Rows already match PolicyViolationSummary - encode them directly rather
+    # than validating and re-dumping each one through Pydantic
+    return ORJSONResponse([row._asdict() for row in rows])
+
+
+@router.get("/violations/{violation_id}", response_model=PolicyViolationRead)
+async def get_policy_violation(violation_id: int, session: AsyncSession = Depends(get_async_session)):
+    """Get a policy violation with its full details"""
+    violation = await session.get(PolicyViolation, violation_id)
+    if not violation:
+        raise HTTPException(status_code=404, detail="Policy violation not found")
+    return violation
@@ -1,56 +1,129 @@
 """
 Compliance report endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
-from sqlmodel import Session, select
+import hashlib
+import os
+from anyio import CapacityLimiter, to_process
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..core.database import get_session
-from ..core.reports import generate_compliance_report
+from ..core.database import get_async_session
+from ..core.reports import (
+    ModelRow, VersionRow, MetricRow, LogRow, generate_compliance_report_bytes
+)
 from ..models import ModelRegistry, ModelVersion, EvaluationMetric, ComplianceLog
 
 router = APIRouter(prefix="/reports", tags=["Compliance Reports"])
 
+REPORT_CACHE_TTL_SECONDS = 3600
+REPORT_CACHE_MAX_ENTRIES = 64
+# Rows rendered per section; limited in SQL so older history is never fetched
+REPORT_MAX_METRICS = 200
+REPORT_MAX_LOGS = 10
+# Reports can carry sensitive model details: never share them from proxy
+# caches, and make browsers revalidate (a cheap 304) before every reuse
+REPORT_CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
+# Concurrent renders per API worker. Leaves half the cores to request
+# handling; extra reports queue for a slot in the long-lived worker pool
+REPORT_RENDER_WORKERS = int(os.getenv("REPORT_RENDER_WORKERS") or max(1, (os.cpu_count() or 2) // 2))
+_render_limiter = CapacityLimiter(REPORT_RENDER_WORKERS)
+
+# Rendered PDFs by fingerprint, bounded per worker. Rendering is deterministic
+# (no wall-clock stamp; the report's "Data As Of" comes from the fingerprinted
+# rows), so a hit is byte-identical to a fresh render and never stale - old
+# entries just age out.
+_report_cache: TTLCache = TTLCache(maxsize=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL_SECONDS)
+
+
+def _report_etag(model_id: int, versions, metrics, logs) -> str:
+    """Fingerprint of everything the report renders; changes on any model write"""
+    # Every model write adds an audit entry, so the newest log id tracks
+    # changes to the model fields themselves
+    fingerprint = ":".join([
+        str(model_id),
+        str(logs[0].id) if logs else "",
+        ",".join(str(v.id) for v in versions),
+        ",".join(str(m.id) for m in metrics),
+    ])
+    return hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+
 
 @router.get("/models/{model_id}/compliance-report")
-def download_compliance_report(model_id: int, session: Session = Depends(get_session)):
+async def download_compliance_report(
+    model_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session)
+):
     """
     Generate and download a PDF compliance report for a model.
     Includes model info, versions, metrics, and audit trail.
+    
+    Rendered PDFs are cached by content fingerprint (ETag); repeat downloads
+    skip rendering and If-None-Match is answered with 304.
     """
-    # Fetch model
-    model = session.get(ModelRegistry, model_id)
+    # Column selects only: the report needs scalars, not ORM instances
+    model = (await session.exec(
+        select(
+            ModelRegistry.id, ModelRegistry.name, ModelRegistry.owner,
+            ModelRegistry.description, ModelRegistry.created_at
+        ).where(ModelRegistry.id == model_id)
+    )).first()
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
+    model = ModelRow(*model)
     
-    # Fetch versions
-    versions = session.exec(
-        select(ModelVersion).where(ModelVersion.model_id == model_id)
-    ).all()
-    
-    # Fetch metrics for all versions
-    version_ids = [v.id for v in versions]
-    metrics = []
-    if version_ids:
-        metrics = session.exec(
-            select(EvaluationMetric).where(EvaluationMetric.version_id.in_(version_ids))
-        ).all()
-    
-    # Fetch audit logs for this model
-    logs = session.exec(
-        select(ComplianceLog)
+    versions = [VersionRow(*row) for row in (await session.exec(
+        select(ModelVersion.id, ModelVersion.version_tag, ModelVersion.s3_path, ModelVersion.created_at)
+        .where(ModelVersion.model_id == model_id)
+        .order_by(ModelVersion.created_at)
+    )).all()]
+    
+    # Newest metrics across all versions and the latest audit entries only
+    metrics = [MetricRow(*row) for row in (await session.exec(
+        select(EvaluationMetric.id, EvaluationMetric.metric_name, EvaluationMetric.value, EvaluationMetric.timestamp)
+        .join(ModelVersion, ModelVersion.id == EvaluationMetric.version_id)
+        .where(ModelVersion.model_id == model_id)
+        .order_by(EvaluationMetric.timestamp.desc())
+        .limit(REPORT_MAX_METRICS)
+    )).all()]
+    logs = [LogRow(*row) for row in (await session.exec(
+        select(
+            ComplianceLog.id, ComplianceLog.action, ComplianceLog.entity_type,
+            ComplianceLog.entity_id, ComplianceLog.timestamp
+        )
         .where(ComplianceLog.entity_type == "ModelRegistry")
         .where(ComplianceLog.entity_id == str(model_id))
         .order_by(ComplianceLog.timestamp.desc())
-    ).all()
-    
-    # Generate PDF
-    pdf_buffer = generate_compliance_report(model, versions, metrics, logs)
+        .limit(REPORT_MAX_LOGS)
+    )).all()]
     
     filename = f"compliance_report_{model.name.replace(' ', '_')}_{model_id}.pdf"
+    fingerprint = _report_etag(model_id, versions, metrics, logs)
+    etag = f'W/"{fingerprint}"'
+    validators = {"ETag": etag, "Cache-Control": REPORT_CACHE_CONTROL}
+    
+    # If-None-Match may list several tags; weak comparison ignores the W/ prefix
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if f'"{fingerprint}"' in client_tags or "*" in client_tags:
+        return Response(status_code=304, headers=validators)
+    
+    headers = {**validators, "Content-Disposition": f"attachment; filename={filename}"}
+    
+    pdf_bytes = _report_cache.get(fingerprint)
+    if pdf_bytes is None:
+        # PDF layout is CPU-bound - render in a worker process, off the event
+        # loop and outside the GIL
+        pdf_bytes = await to_process.run_sync(
+            generate_compliance_report_bytes, model, versions, metrics, logs,
+            limiter=_render_limiter
+        )
+        _report_cache[fingerprint] = pdf_bytes
     
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    # Sent as one body rather than streamed: ReportLab only serializes the
+    # document (objects + xref) in doc.build()'s final save, so no page is
+    # available early, and a complete body keeps Content-Length
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
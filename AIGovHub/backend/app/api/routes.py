@@ -1,30 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select, text, func
+import time
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
+from sqlmodel import select, text, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import insert, tuple_
 from typing import List, Optional
-from ..core.database import get_session, engine
+from datetime import datetime
+from ..core.database import get_async_session, async_session, list_query_options, DEBUG
+from ..core import query_stats
+from ..core.cache import cache, invalidate, DASHBOARD_NAMESPACE
+from ..core.timeutils import utcnow
 from ..models import ModelRegistry, ModelVersion, EvaluationMetric, ComplianceLog, RiskLevel, ComplianceStatus
 from ..schemas import (
     ModelCreate, ModelRead, ModelUpdate,
     VersionCreate, VersionRead,
     MetricCreate, MetricRead,
-    AuditLogRead, HealthStatus,
+    AuditLogRead, AuditLogPage, HealthStatus,
     RiskProfileUpdate, ComplianceStatusUpdate,
-    DashboardStats, RiskLevelCount, ComplianceStatusCount
+    DashboardStats, RiskLevelCount, ComplianceStatusCount,
+    MODEL_READ_LIST, VERSION_READ_LIST
 )
 
 router = APIRouter()
 
 
+def _json_list(adapter: TypeAdapter, rows) -> Response:
+    """Encode ORM rows with a list TypeAdapter, bypassing per-item response-model handling"""
+    items = adapter.validate_python(rows, from_attributes=True)
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+
 # --- Health Check ---
-@router.get("/health", response_model=HealthStatus, tags=["System"])
-def health_check():
-    """Check API and database health"""
+# Load balancers probe every second per instance; reuse the last DB verdict
+# for this long so probes don't each take a pooled connection
+HEALTH_CACHE_SECONDS = 1.0
+_db_health: tuple = (float("-inf"), "unhealthy")
+
+
+async def _database_status() -> str:
+    global _db_health
+    checked_at, db_status = _db_health
+    if time.monotonic() - checked_at < HEALTH_CACHE_SECONDS:
+        return db_status
     db_status = "healthy"
     try:
-        with Session(engine) as session:
-            session.exec(text("SELECT 1"))
+        async with async_session() as session:
+            await session.execute(text("SELECT 1"))
     except Exception:
         db_status = "unhealthy"
+    _db_health = (time.monotonic(), db_status)
+    return db_status
+
+
+@router.get("/health", response_model=HealthStatus, tags=["System"])
+async def health_check():
+    """Check API and database health"""
+    db_status = await _database_status()
     
     return HealthStatus(
         status="ok" if db_status == "healthy" else "degraded",
@@ -33,28 +64,41 @@ def health_check():
     )
 
 
+@router.get("/debug/query-count", tags=["System"], include_in_schema=DEBUG)
+def query_count():
+    """SQL statements executed, in total and per route (N+1 regression checks)"""
+    # Unauthenticated and reveals traffic patterns - development/CI only
+    if not DEBUG:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return query_stats.snapshot()
+
+
 # --- Dashboard ---
 @router.get("/dashboard/stats", response_model=DashboardStats, tags=["Dashboard"])
-def get_dashboard_stats(session: Session = Depends(get_session)):
+@cache(expire=30, namespace=DASHBOARD_NAMESPACE)
+async def get_dashboard_stats(session: AsyncSession = Depends(get_async_session)):
     """Get dashboard statistics for compliance overview"""
-    total_models = session.exec(select(func.count(ModelRegistry.id))).one()
-    total_versions = session.exec(select(func.count(ModelVersion.id))).one()
-    
-    # Count by risk level
-    by_risk = []
-    for level in RiskLevel:
-        count = session.exec(
-            select(func.count(ModelRegistry.id)).where(ModelRegistry.risk_level == level)
-        ).one()
-        by_risk.append(RiskLevelCount(risk_level=level.value, count=count))
-    
-    # Count by compliance status
-    by_status = []
-    for status in ComplianceStatus:
-        count = session.exec(
-            select(func.count(ModelRegistry.id)).where(ModelRegistry.compliance_status == status)
-        ).one()
-        by_status.append(ComplianceStatusCount(status=status.value, count=count))
+    total_versions = (await session.exec(select(func.count()).select_from(ModelVersion))).one()
+    
+    # Count by risk level / compliance status with one GROUP BY each,
+    # then fill zeros for empty buckets
+    risk_counts = dict((await session.exec(
+        select(ModelRegistry.risk_level, func.count()).group_by(ModelRegistry.risk_level)
+    )).all())
+    status_counts = dict((await session.exec(
+        select(ModelRegistry.compliance_status, func.count()).group_by(ModelRegistry.compliance_status)
+    )).all())
+    
+    by_risk = [
+        RiskLevelCount(risk_level=level.value, count=risk_counts.get(level, 0))
+        for level in RiskLevel
+    ]
+    by_status = [
+        ComplianceStatusCount(status=status.value, count=status_counts.get(status, 0))
+        for status in ComplianceStatus
+    ]
+    # Every model has a risk level, so the grouped counts sum to the total
+    total_models = sum(risk_counts.values())
     
     return DashboardStats(
         total_models=total_models,
@@ -66,13 +110,12 @@ def get_dashboard_stats(session: Session = Depends(get_session)):
 
 # --- Model Registry ---
 @router.post("/models/", response_model=ModelRead, tags=["Models"])
-def create_model(payload: ModelCreate, session: Session = Depends(get_session)):
+async def create_model(payload: ModelCreate, session: AsyncSession = Depends(get_async_session)):
     """Register a new AI model"""
     model = ModelRegistry(**payload.model_dump())
     session.add(model)
-    session.commit()
-    session.refresh(model)
-    # Log audit
+    await session.flush()  # Assigns model.id without committing
+    # Log audit in the same transaction
     log = ComplianceLog(
         entity_type="ModelRegistry",
         entity_id=str(model.id),
@@ -80,29 +123,43 @@ def create_model(payload: ModelCreate, session: Session = Depends(get_session)):
         details={"name": model.name}
     )
     session.add(log)
-    session.commit()
+    await session.commit()
+    await invalidate(DASHBOARD_NAMESPACE)
     return model
 
 
-@router.get("/models/", response_model=List[ModelRead], tags=["Models"])
-def read_models(
-    session: Session = Depends(get_session),
+@router.get(
+    "/models/",
+    response_model=None,
+    responses={200: {"model": List[ModelRead]}},
+    tags=["Models"]
+)
+async def read_models(
+    session: AsyncSession = Depends(get_async_session),
+    name: Optional[str] = Query(None, description="Filter by exact model name"),
     risk_level: Optional[RiskLevel] = Query(None, description="Filter by risk level"),
-    compliance_status: Optional[ComplianceStatus] = Query(None, description="Filter by compliance status")
+    compliance_status: Optional[ComplianceStatus] = Query(None, description="Filter by compliance status"),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0)
 ):
-    """List all registered models with optional filters"""
-    query = select(ModelRegistry)
+    """List registered models with optional filters, paginated by limit/offset"""
+    query = select(ModelRegistry).options(*list_query_options())
+    if name:
+        query = query.where(ModelRegistry.name == name)
     if risk_level:
         query = query.where(ModelRegistry.risk_level == risk_level)
     if compliance_status:
         query = query.where(ModelRegistry.compliance_status == compliance_status)
-    return session.exec(query).all()
+    rows = (await session.exec(
+        query.order_by(ModelRegistry.id).offset(offset).limit(limit)
+    )).all()
+    return _json_list(MODEL_READ_LIST, rows)
 
 
 @router.get("/models/{model_id}", response_model=ModelRead, tags=["Models"])
-def read_model(model_id: int, session: Session = Depends(get_session)):
+async def read_model(model_id: int, session: AsyncSession = Depends(get_async_session)):
     """Get a specific model by ID"""
-    model = session.get(ModelRegistry, model_id)
+    model = await session.get(ModelRegistry, model_id)
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
     return model
@@ -110,13 +167,13 @@ def read_model(model_id: int, session: Session = Depends(get_session)):
 
 # --- Risk Profile ---
 @router.patch("/models/{model_id}/risk-profile", response_model=ModelRead, tags=["Models"])
-def update_risk_profile(
+async def update_risk_profile(
     model_id: int,
     payload: RiskProfileUpdate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update model risk profile (risk level, domain, potential harm, etc.)"""
-    model = session.get(ModelRegistry, model_id)
+    model = await session.get(ModelRegistry, model_id)
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
     
@@ -125,10 +182,8 @@ def update_risk_profile(
         setattr(model, key, value)
     
     session.add(model)
-    session.commit()
-    session.refresh(model)
     
-    # Log audit
+    # Log audit in the same transaction
     log = ComplianceLog(
         entity_type="ModelRegistry",
         entity_id=str(model.id),
@@ -136,16 +191,17 @@ def update_risk_profile(
         details=update_data
     )
     session.add(log)
-    session.commit()
+    await session.commit()
+    await invalidate(DASHBOARD_NAMESPACE)
     return model
 
 
 # --- Compliance Status ---
 @router.patch("/models/{model_id}/compliance-status", response_model=ModelRead, tags=["Models"])
-def update_compliance_status(
+async def update_compliance_status(
     model_id: int,
     payload: ComplianceStatusUpdate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update model compliance status (draft → under_review → approved → retired)
     
@@ -153,9 +209,8 @@ def update_compliance_status(
     the action is blocked and a PolicyViolation record is created.
     """
     from ..core.policy_engine import enforce_compliance_status_change
-    from datetime import datetime
     
-    model = session.get(ModelRegistry, model_id)
+    model = await session.get(ModelRegistry, model_id)
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
     
@@ -167,7 +222,7 @@ def update_compliance_status(
         )
     
     # Enforce policies before allowing status change
-    enforcement_result = enforce_compliance_status_change(
+    enforcement_result = await enforce_compliance_status_change(
         session=session,
         model=model,
         new_status=payload.status,
@@ -175,6 +230,8 @@ def update_compliance_status(
     )
     
     if not enforcement_result.allowed:
+        # Persist the violation and its audit entry before rejecting
+        await session.commit()
         raise HTTPException(
             status_code=403,
             detail=f"Policy violation: {enforcement_result.message}"
@@ -185,15 +242,13 @@ def update_compliance_status(
     
     # Capture approval metadata when status changes to approved
     if payload.status == ComplianceStatus.approved:
-        model.approved_at = datetime.utcnow()
+        model.approved_at = utcnow()
         model.approval_notes = payload.approval_notes
         # approved_by_user_id would be set from auth context
     
     session.add(model)
-    session.commit()
-    session.refresh(model)
     
-    # Log audit for compliance status change
+    # Log audit for compliance status change in the same transaction
     log = ComplianceLog(
         entity_type="ModelRegistry",
         entity_id=str(model.id),
@@ -206,18 +261,18 @@ def update_compliance_status(
         }
     )
     session.add(log)
-    session.commit()
+    await session.commit()
+    await invalidate(DASHBOARD_NAMESPACE)
     return model
 
 
 # --- Model Versions ---
 @router.post("/versions/", response_model=VersionRead, tags=["Versions"])
-def create_version(payload: VersionCreate, session: Session = Depends(get_session)):
+async def create_version(payload: VersionCreate, session: AsyncSession = Depends(get_async_session)):
     """Add a new version to a model"""
     version = ModelVersion(**payload.model_dump())
     session.add(version)
-    session.commit()
-    session.refresh(version)
+    await session.flush()  # Assigns version.id without committing
     log = ComplianceLog(
         entity_type="ModelVersion",
         entity_id=str(version.id),
@@ -225,31 +280,99 @@ def create_version(payload: VersionCreate, session: Session = Depends(get_sessio
         details={"tag": version.version_tag}
     )
     session.add(log)
-    session.commit()
+    await session.commit()
+    await invalidate(DASHBOARD_NAMESPACE)
     return version
 
 
-@router.get("/models/{model_id}/versions/", response_model=List[VersionRead], tags=["Versions"])
-def read_versions(model_id: int, session: Session = Depends(get_session)):
-    """List all versions for a model"""
-    return session.exec(select(ModelVersion).where(ModelVersion.model_id == model_id)).all()
+@router.get(
+    "/models/{model_id}/versions/",
+    response_model=None,
+    responses={200: {"model": List[VersionRead]}},
+    tags=["Versions"]
+)
+async def read_versions(
+    model_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
+    """List versions for a model, oldest first, paginated by limit/offset"""
+    rows = (await session.exec(
+        select(ModelVersion)
+        .where(ModelVersion.model_id == model_id)
+        .options(*list_query_options())
+        .order_by(ModelVersion.id)
+        .offset(offset)
+        .limit(limit)
+    )).all()
+    return _json_list(VERSION_READ_LIST, rows)
 
 
 # --- Metrics ---
 @router.post("/metrics/", response_model=MetricRead, tags=["Metrics"])
-def add_metric(payload: MetricCreate, session: Session = Depends(get_session)):
+async def add_metric(payload: MetricCreate, session: AsyncSession = Depends(get_async_session)):
     """Add an evaluation metric to a version"""
     metric = EvaluationMetric(**payload.model_dump())
     session.add(metric)
-    session.commit()
-    session.refresh(metric)
+    await session.commit()
     return metric
 
 
+@router.post("/metrics/bulk", response_model=List[MetricRead], tags=["Metrics"])
+async def add_metrics_bulk(
+    payload: List[MetricCreate] = Body(..., min_length=1, max_length=1000),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Add many evaluation metrics in one transaction (e.g. from a CI run)"""
+    # One timestamp for the whole batch, then all rows as a single
+    # multi-row INSERT ... RETURNING
+    now = utcnow()
+    rows = [{**m.model_dump(), "timestamp": now} for m in payload]
+    metrics = (await session.scalars(
+        insert(EvaluationMetric).returning(EvaluationMetric), rows
+    )).all()
+    await session.commit()
+    return metrics
+
+
 # --- Audit Logs ---
-@router.get("/audit-logs/", response_model=List[AuditLogRead], tags=["Compliance"])
-def read_audit_logs(session: Session = Depends(get_session)):
-    """Get all compliance audit logs"""
-    return session.exec(select(ComplianceLog).order_by(ComplianceLog.timestamp.desc())).all()
+def _parse_log_cursor(cursor: str) -> tuple:
+    # Cursor is "<timestamp>_<id>" of the last row served; the id breaks
+    # timestamp ties so no row is skipped or repeated across pages
+    try:
+        timestamp, log_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(timestamp), int(log_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get(
+    "/audit-logs/",
+    response_model=None,
+    responses={200: {"model": AuditLogPage}},
+    tags=["Compliance"]
+)
+async def read_audit_logs(
+    session: AsyncSession = Depends(get_async_session),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """Get compliance audit logs, newest first, with keyset pagination"""
+    query = select(ComplianceLog).options(*list_query_options())
+    if cursor:
+        query = query.where(
+            tuple_(ComplianceLog.timestamp, ComplianceLog.id) < _parse_log_cursor(cursor)
+        )
+    items = (await session.exec(
+        query.order_by(ComplianceLog.timestamp.desc(), ComplianceLog.id.desc()).limit(limit)
+    )).all()
+    next_cursor = None
+    if len(items) == limit:
+        next_cursor = f"{items[-1].timestamp.isoformat()}_{items[-1].id}"
+    # Encode straight to bytes - the largest list response skips the
+    # response-model revalidation and jsonable_encoder pass
+    page = AuditLogPage(items=items, next_cursor=next_cursor)
+    return Response(content=page.model_dump_json(), media_type="application/json")
 
 
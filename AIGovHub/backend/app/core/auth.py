@@ -9,10 +9,16 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from sqlmodel import SQLModel, Field, Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import exists
+from starlette.concurrency import run_in_threadpool
 import os
 
+from .database import SessionManager
+from .timeutils import utcnow
+
 # --- Configuration ---
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
@@ -40,7 +46,7 @@ class User(SQLModel, table=True):
     hashed_password: str
     is_active: bool = Field(default=True)
     role: UserRole = Field(default=UserRole.auditor)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
 
 
 # --- Schemas ---
@@ -67,8 +73,7 @@ class UserRead(BaseModel):
     is_active: bool
     role: UserRole
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Helper Functions ---
@@ -82,7 +87,7 @@ def get_password_hash(password: str) -> str:
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
+    expire = utcnow() + (expires_delta or timedelta(minutes=15))
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
@@ -98,6 +103,24 @@ def authenticate_user(session: Session, username: str, password: str) -> Optiona
     return user
 
 
+async def get_user_async(session: AsyncSession, username: str) -> Optional[User]:
+    return (await session.exec(select(User).where(User.username == username))).first()
+
+
+async def username_exists_async(session: AsyncSession, username: str) -> bool:
+    return bool(await session.scalar(select(exists().where(User.username == username))))
+
+
+async def authenticate_user_async(username: str, password: str) -> Optional[User]:
+    # Release the connection before the password check instead of holding it
+    async with SessionManager() as session:
+        user = await get_user_async(session, username)
+    # bcrypt is deliberately slow - verify in the threadpool, not on the event loop
+    if not user or not await run_in_threadpool(verify_password, password, user.hashed_password):
+        return None
+    return user
+
+
 # --- Dependencies ---
 def get_current_user_optional(
     token: str = Depends(oauth2_scheme),
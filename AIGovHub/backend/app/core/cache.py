@@ -0,0 +1,70 @@
+"""
+Response caching for read-heavy endpoints (fastapi-cache2).
+
+Uses Redis when REDIS_URL is set so all workers share entries and
+invalidations, otherwise a per-process in-memory store.
+"""
+import os
+import hashlib
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.decorator import cache  # re-exported for route modules
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_PREFIX = "aigov"
+
+DASHBOARD_NAMESPACE = "dashboard"
+POLICIES_NAMESPACE = "policies"
+ORGANIZATIONS_NAMESPACE = "organizations"
+
+
+def request_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> str:
+    """Key on route, query string and caller identity.
+
+    The default builder hashes the handler kwargs, which include the
+    per-request DB session and so never repeat. The Authorization header is
+    part of the key so a response is never served to a different principal.
+    """
+    parts = [f"{func.__module__}:{func.__name__}"]
+    if request is not None:
+        parts.append(request.url.path)
+        parts.append(str(sorted(request.query_params.multi_items())))
+        parts.append(request.headers.get("authorization", ""))
+    digest = hashlib.blake2b("\x00".join(parts).encode(), digest_size=16).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def init_response_cache() -> None:
+    """Configure FastAPICache (call once at startup)"""
+    backend = InMemoryBackend()
+    if REDIS_URL:
+        try:
+            from redis import asyncio as aioredis
+            from fastapi_cache.backends.redis import RedisBackend
+            backend = RedisBackend(aioredis.from_url(REDIS_URL))
+        except ImportError:
+            logger.warning("redis not installed. Falling back to in-memory response cache.")
+    FastAPICache.init(backend, prefix=CACHE_PREFIX, key_builder=request_key_builder)
+
+
+async def invalidate(*namespaces: str) -> None:
+    """Drop cached responses after a write; cache errors never fail the write"""
+    for namespace in namespaces:
+        try:
+            await FastAPICache.clear(namespace=namespace)
+        except Exception as e:
+            logger.warning(f"Response cache invalidation failed for {namespace}: {e}")
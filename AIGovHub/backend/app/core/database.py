@@ -1,13 +1,102 @@
-from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel import SQLModel, create_engine, Session, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker, raiseload
 import os
+import orjson
 
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/ai_governance")
+# Development mode: unintended lazy loads raise instead of silently querying
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+# Async drivers for the same database (asyncpg for Postgres, aiosqlite for SQLite)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Pre-ping and recycle drop connections the server or a proxy closed
+_POOL_COMMON = {"pool_timeout": 10, "pool_pre_ping": True, "pool_recycle": 1800}
+
+# The async engine serves the API routes. Each worker process holds up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections here, plus the sync pool below -
+# keep workers x (that total) under Postgres max_connections (default 100)
+ASYNC_POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "5")),
+    **_POOL_COMMON,
+}
+# The sync engine only serves startup table creation and GET /auth/me
+SYNC_POOL_OPTIONS = {"pool_size": 2, "max_overflow": 3, **_POOL_COMMON}
+
+
+def _pool_options(url, options: dict) -> dict:
+    # SQLite uses a single-connection pool that takes none of these
+    return {} if make_url(url).get_backend_name() == "sqlite" else options
+
+
+def _json_dumps(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+# JSONB columns (audit/violation details) encode and decode with orjson
+JSON_OPTIONS = {"json_serializer": _json_dumps, "json_deserializer": orjson.loads}
+
+engine = create_engine(DATABASE_URL, echo=True, **JSON_OPTIONS, **_pool_options(DATABASE_URL, SYNC_POOL_OPTIONS))
+SessionLocal = sessionmaker(bind=engine, class_=Session, autoflush=False, expire_on_commit=False)
+
+
+def _async_url(url: str):
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername))
+
+
+_async_url_obj = _async_url(DATABASE_URL)
+async_engine = create_async_engine(_async_url_obj, **JSON_OPTIONS, **_pool_options(_async_url_obj, ASYNC_POOL_OPTIONS))
+async_session = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+class SessionManager:
+    """Session scoped to an explicit block inside a handler.
+
+    Unlike a Depends() session, which is held until the request finishes,
+    the connection goes back to the pool as soon as the block exits, so
+    slow non-DB work (e.g. password hashing) does not pin it.
+    `with` yields a sync Session, `async with` an AsyncSession.
+    """
+
+    def __enter__(self) -> Session:
+        self._session = SessionLocal()
+        return self._session
+
+    def __exit__(self, *exc) -> None:
+        self._session.close()
+
+    async def __aenter__(self) -> AsyncSession:
+        self._async_session = async_session()
+        return self._async_session
+
+    async def __aexit__(self, *exc) -> None:
+        await self._async_session.close()
+
+
+def list_query_options() -> list:
+    """Loader options for list endpoints - raiseload("*") under DEBUG"""
+    return [raiseload("*")] if DEBUG else []
 
-engine = create_engine(DATABASE_URL, echo=True)
 
 def get_session():
     with Session(engine) as session:
         yield session
 
+async def get_async_session():
+    async with async_session() as session:
+        yield session
+
 def create_db_and_tables():
+    if engine.dialect.name == "postgresql":
+        # Policy.name is CITEXT (trusted extension, no superuser needed)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS citext"))
     SQLModel.metadata.create_all(engine)
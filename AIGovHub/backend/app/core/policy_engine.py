@@ -2,13 +2,21 @@
 Policy enforcement service.
 Checks policies before allowing governance actions and records violations.
 """
-from typing import Optional, List, Tuple
-from sqlmodel import Session, select
+import time
+from typing import Optional, List, Tuple, Dict
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import exists
 from ..models import (
     Policy, PolicyViolation, PolicyConditionType,
-    ModelRegistry, ModelVersion, EvaluationMetric, ComplianceLog, ComplianceStatus
+    ModelRegistry, ModelVersion, EvaluationMetric, ComplianceLog, ComplianceStatus,
+    RiskLevel
 )
 
+# Risk levels the high-risk policies apply to; a frozenset gives a hashed
+# membership test instead of rebuilding and scanning a list on every check
+HIGH_RISK_LEVELS = frozenset({RiskLevel.high, RiskLevel.unacceptable})
+
 
 class PolicyEnforcementResult:
     """Result of policy enforcement check"""
@@ -18,19 +26,37 @@ class PolicyEnforcementResult:
         self.message = message
 
 
-def get_active_policies(session: Session, organization_id: Optional[int] = None) -> List[Policy]:
+# Active policies per organization: policies change rarely, status changes
+# often. Cleared on every policy write in this process; other workers pick
+# up changes once the TTL lapses.
+POLICY_CACHE_TTL_SECONDS = 30
+_policy_cache: Dict[Optional[int], Tuple[float, List[Policy]]] = {}
+
+
+def invalidate_policy_cache() -> None:
+    """Drop cached active policies (call after any policy create/update/delete)"""
+    _policy_cache.clear()
+
+
+async def get_active_policies(session: AsyncSession, organization_id: Optional[int] = None) -> List[Policy]:
     """Get all active policies, optionally filtered by organization"""
+    cached = _policy_cache.get(organization_id)
+    if cached and time.monotonic() - cached[0] < POLICY_CACHE_TTL_SECONDS:
+        return cached[1]
+    
     query = select(Policy).where(Policy.is_active == True)
     if organization_id:
         # Include global policies and org-specific policies
         query = query.where(
             (Policy.organization_id == None) | (Policy.organization_id == organization_id)
         )
-    return list(session.exec(query).all())
+    policies = list((await session.exec(query)).all())
+    _policy_cache[organization_id] = (time.monotonic(), policies)
+    return policies
 
 
-def check_require_evaluation_before_approval(
-    session: Session,
+async def check_require_evaluation_before_approval(
+    session: AsyncSession,
     model: ModelRegistry,
     new_status: ComplianceStatus
 ) -> bool:
@@ -41,18 +67,16 @@ def check_require_evaluation_before_approval(
     if new_status != ComplianceStatus.approved:
         return True  # Policy only applies when approving
     
-    # Check if any version has evaluation metrics
-    for version in model.versions:
-        metric_count = session.exec(
-            select(EvaluationMetric).where(EvaluationMetric.version_id == version.id)
-        ).first()
-        if metric_count:
-            return True
-    return False
-
-
-def check_block_high_risk_without_approval(
-    session: Session,
+    # Check if any version has evaluation metrics - a single EXISTS, without
+    # loading model.versions
+    return (await session.exec(select(exists().where(
+        EvaluationMetric.version_id == ModelVersion.id,
+        ModelVersion.model_id == model.id,
+    )))).one()
+
+
+async def check_block_high_risk_without_approval(
+    session: AsyncSession,
     model: ModelRegistry,
     new_status: ComplianceStatus
 ) -> bool:
@@ -60,7 +84,7 @@ def check_block_high_risk_without_approval(
     Prevent high-risk models from bypassing review.
     Returns True if condition is satisfied, False if violated.
     """
-    if model.risk_level not in ["high", "unacceptable"]:
+    if model.risk_level not in HIGH_RISK_LEVELS:
         return True  # Policy only applies to high-risk models
     
     # High-risk models must go through under_review before approved
@@ -69,8 +93,8 @@ def check_block_high_risk_without_approval(
     return True
 
 
-def check_require_review_for_high_risk(
-    session: Session,
+async def check_require_review_for_high_risk(
+    session: AsyncSession,
     model: ModelRegistry,
     new_status: ComplianceStatus
 ) -> bool:
@@ -78,7 +102,7 @@ def check_require_review_for_high_risk(
     High-risk models require explicit review status.
     Returns True if condition is satisfied, False if violated.
     """
-    if model.risk_level not in ["high", "unacceptable"]:
+    if model.risk_level not in HIGH_RISK_LEVELS:
         return True
     
     # Any status change for high-risk models is allowed but logged
@@ -92,54 +116,58 @@ POLICY_CHECKS = {
 }
 
 
-def enforce_compliance_status_change(
-    session: Session,
+async def enforce_compliance_status_change(
+    session: AsyncSession,
     model: ModelRegistry,
     new_status: ComplianceStatus,
     user_id: Optional[int] = None
 ) -> PolicyEnforcementResult:
     """
     Enforce all active policies for a compliance status change.
-    Returns enforcement result with violation details if blocked.
+    Returns enforcement result with violation details if blocked; the
+    violation is added to the session but not committed.
     """
-    policies = get_active_policies(session, model.organization_id)
+    policies = await get_active_policies(session, model.organization_id)
     
+    # Each condition is evaluated once: policies sharing a condition type would
+    # re-run the same (possibly DB-backed) check, so keep the first of each
+    checks: Dict[PolicyConditionType, Policy] = {}
     for policy in policies:
-        check_fn = POLICY_CHECKS.get(policy.condition_type)
-        if not check_fn:
-            continue
-        
-        if not check_fn(session, model, new_status):
+        if policy.condition_type in POLICY_CHECKS:
+            checks.setdefault(policy.condition_type, policy)
+    
+    for condition_type, policy in checks.items():
+        if not await POLICY_CHECKS[condition_type](session, model, new_status):
             # Policy violated - create violation record
             violation = PolicyViolation(
                 policy_id=policy.id,
                 model_id=model.id,
                 user_id=user_id,
                 action="change_compliance_status",
+                attempted_status=new_status,
+                current_status=model.compliance_status,
                 details={
-                    "attempted_status": new_status.value,
-                    "current_status": model.compliance_status.value,
                     "policy_name": policy.name,
                     "policy_condition": policy.condition_type.value,
                     "reason": f"Policy '{policy.name}' blocked this action"
                 }
             )
-            session.add(violation)
-            
-            # Also log to audit trail
+            # Audit trail entry mirrors the violation; both go out in the
+            # caller's single flush
             audit_log = ComplianceLog(
                 entity_type="PolicyViolation",
                 entity_id=str(model.id),
                 action="POLICY_VIOLATION",
                 details={
-                    "policy_id": policy.id,
+                    "policy_id": violation.policy_id,
                     "policy_name": policy.name,
-                    "attempted_action": "change_compliance_status",
+                    "attempted_action": violation.action,
                     "blocked": True
                 }
             )
-            session.add(audit_log)
-            session.commit()
+            session.add_all([violation, audit_log])
+            # Not committed here - the caller's transaction owns the
+            # violation and must commit it before rejecting the request
             
             return PolicyEnforcementResult(
                 allowed=False,
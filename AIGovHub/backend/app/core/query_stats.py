@@ -0,0 +1,77 @@
+"""
+SQL statement counting for spotting N+1 regressions.
+
+Every statement on either engine is counted, globally and per request.
+Under DEBUG the per-route totals are exposed at /debug/query-count and each
+response carries an X-Query-Count header, so CI load tests can assert on
+query budgets; in production neither is exposed.
+"""
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+from .database import engine, async_engine, DEBUG
+
+# Mutable cell per request; the context is copied into SQLAlchemy's greenlets
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar("request_queries", default=None)
+
+total_queries = 0
+route_stats: Dict[str, Dict[str, int]] = {}
+# Requests that matched no route (404/405) share one entry - keying them by
+# raw path or method would let arbitrary requests grow route_stats unbounded
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _count_query(*_args) -> None:
+    global total_queries
+    total_queries += 1
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+event.listen(engine, "before_cursor_execute", _count_query)
+event.listen(async_engine.sync_engine, "before_cursor_execute", _count_query)
+
+
+class QueryCountMiddleware:
+    """ASGI middleware recording the number of SQL statements per request"""
+
+    def __init__(self, app, emit_header: bool = DEBUG):
+        self.app = app
+        # X-Query-Count reveals internals on every endpoint - DEBUG only by default
+        self.emit_header = emit_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        counter = [0]
+        token = _request_queries.set(counter)
+
+        async def send_with_count(message):
+            if self.emit_header and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(counter[0]).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _request_queries.reset(token)
+            route = scope.get("route")
+            if route is not None and scope["method"] in getattr(route, "methods", ()):
+                key = f"{scope['method']} {route.path}"
+            else:
+                key = UNMATCHED_ROUTE
+            stats = route_stats.setdefault(key, {"requests": 0, "queries": 0, "max": 0})
+            stats["requests"] += 1
+            stats["queries"] += counter[0]
+            stats["max"] = max(stats["max"], counter[0])
+
+
+def snapshot() -> dict:
+    """Totals for the /debug/query-count endpoint"""
+    return {"total_queries": total_queries, "routes": route_stats}
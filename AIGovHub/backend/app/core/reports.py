@@ -4,157 +4,227 @@ Generates EU AI Act style compliance reports for registered models.
 """
 from io import BytesIO
 from datetime import datetime
+from typing import NamedTuple, Optional, Sequence
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, Flowable
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
-from ..models import ModelRegistry, ModelVersion, EvaluationMetric, ComplianceLog
+
+
+# Plain column rows (not ORM instances): fetched with column selects, and
+# picklable so they can be handed to a worker process as-is
+class ModelRow(NamedTuple):
+    id: int
+    name: str
+    owner: str
+    description: Optional[str]
+    created_at: datetime
+
+
+class VersionRow(NamedTuple):
+    id: int
+    version_tag: str
+    s3_path: Optional[str]
+    created_at: datetime
+
+
+class MetricRow(NamedTuple):
+    id: int
+    metric_name: str
+    value: float
+    timestamp: datetime
+
+
+class LogRow(NamedTuple):
+    id: int
+    action: str
+    entity_type: str
+    entity_id: str
+    timestamp: datetime
+
+
+# Skip per-shape argument validation during layout
+rl_config.shapeChecking = 0
+
+# The report only uses the built-in Type 1 fonts (nothing to register); load
+# their metrics at import so the first report in each worker doesn't pay for it
+for _font_name in ("Helvetica", "Helvetica-Bold", "Helvetica-BoldOblique"):
+    pdfmetrics.getFont(_font_name)
+
+# Styles are immutable once built - create them once per process, not per report
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    textColor=colors.HexColor('#1a365d')
+)
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    spaceBefore=20,
+    spaceAfter=10,
+    textColor=colors.HexColor('#2c5282')
+)
+_HEADING3_STYLE = _STYLES['Heading3']
+_NORMAL_STYLE = _STYLES['Normal']
+
+_DATE_FMT = "%Y-%m-%d"
+_TS_FMT = "%Y-%m-%d %H:%M"
+_TS_UTC_FMT = _TS_FMT + " UTC"
+
+_HEADER_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+])
+_MODEL_TABLE_STYLE = TableStyle(_HEADER_TABLE_STYLE.getCommands() + [
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a365d')),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+])
+
+
+# Static flowables shared by every report. Spacers hold no layout state and
+# the disclaimer never changes, so one instance of each serves all builds.
+_SPACER_SMALL = Spacer(1, 20)
+_SPACER_LARGE = Spacer(1, 30)
+_DISCLAIMER = Paragraph("""
+    This report is generated automatically by the AI Model Governance Hub. 
+    It provides a summary of model registration, versioning, and evaluation data 
+    for compliance documentation purposes. This report should be reviewed by 
+    appropriate personnel before submission to regulatory bodies.
+    """, _NORMAL_STYLE)
+
+
+def _data_as_of(
+    model: ModelRow,
+    versions: Sequence[VersionRow],
+    metrics: Sequence[MetricRow],
+    logs: Sequence[LogRow]
+) -> datetime:
+    """Newest timestamp among the rendered rows (model writes are audit-logged)"""
+    return max([
+        model.created_at,
+        *(v.created_at for v in versions),
+        *(m.timestamp for m in metrics),
+        *(log.timestamp for log in logs),
+    ])
+
+
+def _section(title: str, body: Flowable, spacer: Optional[Spacer] = _SPACER_SMALL) -> list[Flowable]:
+    """Numbered section: heading, body, then the gap before the next section"""
+    flowables = [Paragraph(title, _HEADING_STYLE), body]
+    if spacer is not None:
+        flowables.append(spacer)
+    return flowables
 
 
 def generate_compliance_report(
-    model: ModelRegistry,
-    versions: list[ModelVersion],
-    metrics: list[EvaluationMetric],
-    logs: list[ComplianceLog]
+    model: ModelRow,
+    versions: Sequence[VersionRow],
+    metrics: Sequence[MetricRow],
+    logs: Sequence[LogRow]
 ) -> BytesIO:
     """
     Generate a PDF compliance report for a given model.
+    Callers pass only the rows to render (e.g. the latest audit entries).
     Returns a BytesIO buffer containing the PDF.
     """
     buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
-    
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#1a365d')
-    )
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceBefore=20,
-        spaceAfter=10,
-        textColor=colors.HexColor('#2c5282')
+    # invariant: no random document ID / creation date - together with the
+    # data-derived "Data As Of" stamp below, identical rows render to
+    # identical bytes; pageCompression: zlib-compress page streams
+    doc = SimpleDocTemplate(
+        buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch,
+        invariant=1, pageCompression=1
     )
-    normal_style = styles['Normal']
-    
-    elements = []
     
     # --- Title ---
-    elements.append(Paragraph("AI Model Compliance Report", title_style))
-    elements.append(Paragraph(f"EU AI Act Documentation", styles['Heading3']))
-    elements.append(Spacer(1, 20))
+    elements = [
+        Paragraph("AI Model Compliance Report", _TITLE_STYLE),
+        Paragraph("EU AI Act Documentation", _HEADING3_STYLE),
+        _SPACER_SMALL,
+    ]
     
     # --- Model Information ---
-    elements.append(Paragraph("1. Model Information", heading_style))
     model_data = [
         ["Field", "Value"],
         ["Model ID", str(model.id)],
         ["Model Name", model.name],
         ["Owner", model.owner],
         ["Description", model.description or "N/A"],
-        ["Registration Date", model.created_at.strftime("%Y-%m-%d %H:%M UTC")],
-        ["Report Generated", datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")],
+        ["Registration Date", model.created_at.strftime(_TS_UTC_FMT)],
+        ["Data As Of", _data_as_of(model, versions, metrics, logs).strftime(_TS_UTC_FMT)],
     ]
-    model_table = Table(model_data, colWidths=[2*inch, 4*inch])
-    model_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a365d')),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-    ]))
-    elements.append(model_table)
-    elements.append(Spacer(1, 20))
+    elements.extend(_section(
+        "1. Model Information",
+        Table(model_data, colWidths=[2*inch, 4*inch], style=_MODEL_TABLE_STYLE)
+    ))
     
     # --- Version History ---
-    elements.append(Paragraph("2. Version History", heading_style))
     if versions:
-        version_data = [["Version", "Artifact Path", "Created"]]
-        for v in versions:
-            version_data.append([
-                v.version_tag,
-                v.s3_path or "N/A",
-                v.created_at.strftime("%Y-%m-%d")
-            ])
-        version_table = Table(version_data, colWidths=[1.5*inch, 3*inch, 1.5*inch])
-        version_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-        elements.append(version_table)
+        version_data = [
+            ["Version", "Artifact Path", "Created"],
+            *[[v.version_tag, v.s3_path or "N/A", v.created_at.strftime(_DATE_FMT)] for v in versions],
+        ]
+        version_body = Table(version_data, colWidths=[1.5*inch, 3*inch, 1.5*inch], style=_HEADER_TABLE_STYLE)
     else:
-        elements.append(Paragraph("No versions registered.", normal_style))
-    elements.append(Spacer(1, 20))
+        version_body = Paragraph("No versions registered.", _NORMAL_STYLE)
+    elements.extend(_section("2. Version History", version_body))
     
     # --- Evaluation Metrics ---
-    elements.append(Paragraph("3. Evaluation Metrics", heading_style))
     if metrics:
-        metric_data = [["Metric", "Value", "Recorded"]]
-        for m in metrics:
-            metric_data.append([
-                m.metric_name,
-                f"{m.value:.4f}",
-                m.timestamp.strftime("%Y-%m-%d")
-            ])
-        metric_table = Table(metric_data, colWidths=[2*inch, 2*inch, 2*inch])
-        metric_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-        elements.append(metric_table)
+        metric_data = [
+            ["Metric", "Value", "Recorded"],
+            *[[m.metric_name, f"{m.value:.4f}", m.timestamp.strftime(_DATE_FMT)] for m in metrics],
+        ]
+        metric_body = Table(metric_data, colWidths=[2*inch, 2*inch, 2*inch], style=_HEADER_TABLE_STYLE)
     else:
-        elements.append(Paragraph("No evaluation metrics recorded.", normal_style))
-    elements.append(Spacer(1, 20))
+        metric_body = Paragraph("No evaluation metrics recorded.", _NORMAL_STYLE)
+    elements.extend(_section("3. Evaluation Metrics", metric_body))
     
     # --- Audit Trail ---
-    elements.append(Paragraph("4. Compliance Audit Trail", heading_style))
     if logs:
-        log_data = [["Action", "Entity", "Timestamp"]]
-        for log in logs[:10]:  # Last 10 entries
-            log_data.append([
-                log.action,
-                f"{log.entity_type} #{log.entity_id}",
-                log.timestamp.strftime("%Y-%m-%d %H:%M")
-            ])
-        log_table = Table(log_data, colWidths=[1.5*inch, 2.5*inch, 2*inch])
-        log_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e2e8f0')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-        elements.append(log_table)
+        log_data = [
+            ["Action", "Entity", "Timestamp"],
+            *[
+                [log.action, f"{log.entity_type} #{log.entity_id}", log.timestamp.strftime(_TS_FMT)]
+                for log in logs
+            ],
+        ]
+        log_body = Table(log_data, colWidths=[1.5*inch, 2.5*inch, 2*inch], style=_HEADER_TABLE_STYLE)
     else:
-        elements.append(Paragraph("No audit logs available.", normal_style))
-    elements.append(Spacer(1, 30))
+        log_body = Paragraph("No audit logs available.", _NORMAL_STYLE)
+    elements.extend(_section("4. Compliance Audit Trail", log_body, _SPACER_LARGE))
     
     # --- Disclaimer ---
-    elements.append(Paragraph("5. Compliance Declaration", heading_style))
-    disclaimer = """
-    This report is generated automatically by the AI Model Governance Hub. 
-    It provides a summary of model registration, versioning, and evaluation data 
-    for compliance documentation purposes. This report should be reviewed by 
-    appropriate personnel before submission to regulatory bodies.
-    """
-    elements.append(Paragraph(disclaimer, normal_style))
+    elements.extend(_section("5. Compliance Declaration", _DISCLAIMER, spacer=None))
     
     # Build PDF
     doc.build(elements)
     buffer.seek(0)
     return buffer
+
+
+def generate_compliance_report_bytes(
+    model: ModelRow,
+    versions: Sequence[VersionRow],
+    metrics: Sequence[MetricRow],
+    logs: Sequence[LogRow]
+) -> bytes:
+    """
+    Process-pool entry point for generate_compliance_report.
+    Returns the PDF bytes rather than a BytesIO buffer.
+    """
+    return generate_compliance_report(model, versions, metrics, logs).getvalue()
@@ -0,0 +1,13 @@
+"""
+Timestamp helpers.
+"""
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    """
+    Current UTC time as a naive datetime.
+    Replaces the deprecated datetime.utcnow(); stays naive because every
+    timestamp column is TIMESTAMP WITHOUT TIME ZONE holding UTC.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -1,7 +1,10 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .core.database import create_db_and_tables
+from .core.query_stats import QueryCountMiddleware
+from .core.cache import init_response_cache
 from .api import routes
 from .api import auth_routes
 from .api import report_routes
@@ -10,17 +13,21 @@ from .api import organization_routes
 from .api import metrics_routes
 from .api import lineage_routes
 from .api import ai_routes
+from .services.ai_governance import save_caches
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
+    init_response_cache()
     yield
+    save_caches()
 
 app = FastAPI(
     title="AI Governance Hub API",
     description="API for AI Model Governance & Compliance - v0.4 with US Governance & Lineage",
     version="0.4.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 import re
@@ -33,6 +40,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL statement counts (X-Query-Count and /debug/query-count under DEBUG)
+app.add_middleware(QueryCountMiddleware)
+
 # Core API routes
 app.include_router(routes.router, prefix="/api/v1")
 
@@ -3,7 +3,9 @@ from datetime import datetime
 from enum import Enum
 from sqlmodel import SQLModel, Field, Relationship
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
+
+from ..core.timeutils import utcnow
 
 
 class RiskLevel(str, Enum):
@@ -41,11 +43,16 @@ class DataClassification(str, Enum):
 
 
 class ModelRegistry(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_model_risk", "risk_level"),
+        Index("ix_model_status", "compliance_status"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True)
     description: Optional[str] = None
     owner: str
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     
     # Multi-tenancy fields
     organization_id: Optional[int] = Field(default=None, foreign_key="organization.id")
@@ -75,36 +82,64 @@ class ModelRegistry(SQLModel, table=True):
     approved_at: Optional[datetime] = None
     approval_notes: Optional[str] = None
     
-    versions: List["ModelVersion"] = Relationship(back_populates="model")
+    # Collections raise instead of lazy-loading; query them or use selectinload()
+    versions: List["ModelVersion"] = Relationship(
+        back_populates="model", sa_relationship_kwargs={"lazy": "raise_on_sql"}
+    )
 
 
 class ModelVersion(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_version_model", "model_id"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     model_id: int = Field(foreign_key="modelregistry.id")
     version_tag: str
     s3_path: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     
     model: ModelRegistry = Relationship(back_populates="versions")
-    metrics: List["EvaluationMetric"] = Relationship(back_populates="version")
+    metrics: List["EvaluationMetric"] = Relationship(
+        back_populates="version", sa_relationship_kwargs={"lazy": "raise_on_sql"}
+    )
 
 
 class EvaluationMetric(SQLModel, table=True):
+    __table_args__ = (
+        # Metrics per version, newest first (report, policy EXISTS check)
+        Index("ix_metric_version_ts", "version_id", "timestamp"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     version_id: int = Field(foreign_key="modelversion.id")
     metric_name: str
     value: float
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utcnow)
     
     version: ModelVersion = Relationship(back_populates="metrics")
 
 
 class ComplianceLog(SQLModel, table=True):
+    __table_args__ = (
+        # Per-entity history, newest first (model report, audit trail)
+        # INCLUDE id/action so the report's audit rows come from an index-only scan
+        Index(
+            "ix_log_entity", "entity_type", "entity_id", "timestamp",
+            postgresql_include=["id", "action"]
+        ),
+        Index("ix_log_timestamp", "timestamp"),
+        Index(
+            "ix_log_details_gin", "details",
+            postgresql_using="gin", postgresql_ops={"details": "jsonb_path_ops"}
+        ),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     entity_type: str 
     entity_id: str
     action: str
     details: Optional[dict] = Field(default=None, sa_column=Column(JSONB))
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utcnow)
 
 
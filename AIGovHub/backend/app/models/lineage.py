@@ -9,6 +9,8 @@ from sqlmodel import SQLModel, Field, Relationship
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy import Column
 
+from ..core.timeutils import utcnow
+
 
 class DatasetType(str, Enum):
     """Type of dataset"""
@@ -47,7 +49,7 @@ class Dataset(SQLModel, table=True):
     # Metadata
     record_count: Optional[int] = None
     schema_info: Optional[dict] = Field(default=None, sa_column=Column(JSONB))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     updated_at: Optional[datetime] = None
 
 
@@ -62,7 +64,7 @@ class ModelDatasetLink(SQLModel, table=True):
     dataset_id: int = Field(foreign_key="dataset.id")
     dataset_type: DatasetType = Field(default=DatasetType.training)
     notes: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
 
 
 class ModelDependency(SQLModel, table=True):
@@ -77,4 +79,4 @@ class ModelDependency(SQLModel, table=True):
     child_version_id: Optional[int] = Field(default=None, foreign_key="modelversion.id")
     dependency_type: DependencyType = Field(default=DependencyType.derived_from)
     notes: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
@@ -6,6 +6,8 @@ from datetime import datetime
 from enum import Enum
 from sqlmodel import SQLModel, Field, Relationship
 
+from ..core.timeutils import utcnow
+
 
 class Environment(str, Enum):
     """Deployment environment for models"""
@@ -23,5 +25,5 @@ class Organization(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True, unique=True)
     description: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     is_active: bool = Field(default=True)
@@ -6,8 +6,11 @@ from typing import Optional
 from datetime import datetime
 from enum import Enum
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import Column
+from sqlalchemy.dialects.postgresql import JSONB, CITEXT
+from sqlalchemy import Column, Index
+
+from ..core.timeutils import utcnow
+from .all_models import ComplianceStatus
 
 
 class PolicyScope(str, Enum):
@@ -29,19 +32,27 @@ class Policy(SQLModel, table=True):
     Governance policy definition.
     Policies define rules that are enforced during model lifecycle operations.
     """
+    __table_args__ = (
+        Index("ix_policy_active_scope_created", "is_active", "scope", "created_at"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
-    name: str = Field(index=True, unique=True)
+    # Case-insensitive: "PII Policy" and "pii policy" are the same policy
+    name: str = Field(sa_column=Column(CITEXT, index=True, unique=True, nullable=False))
     description: Optional[str] = None
     scope: PolicyScope = Field(default=PolicyScope.global_)
     condition_type: PolicyConditionType
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     updated_at: Optional[datetime] = None
     
     # Optional organization scope (for organization-scoped policies)
     organization_id: Optional[int] = None
     
-    violations: list["PolicyViolation"] = Relationship(back_populates="policy")
+    # Unbounded history: never lazy-load it - query PolicyViolation with a limit
+    violations: list["PolicyViolation"] = Relationship(
+        back_populates="policy", sa_relationship_kwargs={"lazy": "raise_on_sql"}
+    )
 
 
 class PolicyViolation(SQLModel, table=True):
@@ -49,13 +60,27 @@ class PolicyViolation(SQLModel, table=True):
     Record of a policy violation attempt.
     Created when an action is blocked due to policy enforcement.
     """
+    __table_args__ = (
+        Index("ix_violation_model_created", "model_id", "created_at"),
+        Index("ix_violation_policy_created", "policy_id", "created_at"),
+        # Containment queries on details (details @> '{"policy_condition": ...}')
+        Index(
+            "ix_violation_details_gin", "details",
+            postgresql_using="gin", postgresql_ops={"details": "jsonb_path_ops"}
+        ),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     policy_id: int = Field(foreign_key="policy.id")
     model_id: Optional[int] = Field(default=None, foreign_key="modelregistry.id")
     model_version_id: Optional[int] = Field(default=None, foreign_key="modelversion.id")
     user_id: Optional[int] = Field(default=None, foreign_key="user.id")
     action: str  # e.g., "approve_model", "change_status", "deploy_model"
+    # Status pair of a blocked status change - real columns rather than
+    # details keys, so list views read them without decoding JSON
+    attempted_status: Optional[ComplianceStatus] = None
+    current_status: Optional[ComplianceStatus] = None
     details: Optional[dict] = Field(default=None, sa_column=Column(JSONB))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     
     policy: Policy = Relationship(back_populates="violations")
@@ -2,44 +2,12 @@
 Pydantic schemas for API request/response validation.
 Separates API contracts from database models.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
-from enum import Enum
 
-
-class RiskLevel(str, Enum):
-    """EU AI Act risk classification levels"""
-    unclassified = "unclassified"
-    minimal = "minimal"
-    limited = "limited"
-    high = "high"
-    unacceptable = "unacceptable"
-
-
-class ComplianceStatus(str, Enum):
-    """Compliance lifecycle status"""
-    draft = "draft"
-    under_review = "under_review"
-    approved = "approved"
-    retired = "retired"
-
-
-class DataSensitivity(str, Enum):
-    """Data sensitivity levels for US governance"""
-    public = "public"
-    internal = "internal"
-    pii = "pii"
-    phi = "phi"
-    pci = "pci"
-
-
-class DataClassification(str, Enum):
-    """Data classification levels for enterprise governance"""
-    public = "public"
-    internal = "internal"
-    confidential = "confidential"
-    restricted = "restricted"
+# Enums are shared with the ORM models, not redefined, so API and DB values cannot drift
+from .models import RiskLevel, ComplianceStatus, DataSensitivity, DataClassification
 
 
 # --- Model Registry Schemas ---
@@ -84,8 +52,7 @@ class ModelRead(BaseModel):
     approved_at: Optional[datetime]
     approval_notes: Optional[str]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ModelUpdate(BaseModel):
@@ -128,8 +95,12 @@ class VersionRead(BaseModel):
     s3_path: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# List adapters: validate ORM rows and encode JSON in one pass in pydantic-core
+MODEL_READ_LIST = TypeAdapter(List[ModelRead])
+VERSION_READ_LIST = TypeAdapter(List[VersionRead])
 
 
 # --- Evaluation Metric Schemas ---
@@ -148,8 +119,7 @@ class MetricRead(BaseModel):
     value: float
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Compliance Log Schema ---
@@ -162,8 +132,13 @@ class AuditLogRead(BaseModel):
     details: Optional[dict]
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AuditLogPage(BaseModel):
+    """One page of audit logs; pass next_cursor back as ?cursor= for the next"""
+    items: List[AuditLogRead]
+    next_cursor: Optional[str] = None
 
 
 # --- Health Check Schema ---
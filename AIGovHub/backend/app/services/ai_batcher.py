@@ -0,0 +1,109 @@
+"""
+Micro-batching coalescer for Gemini requests.
+
+Requests arriving together are drained as one batch: identical prompts to
+the same model are coalesced into a single Gemini call and distinct prompts
+are dispatched concurrently, so bursts of duplicate AI requests cost one
+round-trip instead of N.
+
+A batch closes as soon as no further request arrives within a short idle
+gap (AI_BATCH_IDLE_MS, default 2 ms); requests already queued join without
+any wait. Only while requests keep arriving does the batch stay open, up to
+the full window (AI_BATCH_WINDOW_MS) or AI_BATCH_MAX_SIZE requests. A lone
+request therefore waits at most the idle gap, not the whole window.
+
+Note: Gemini's batch mode is an offline job API (minutes to hours), so it is
+not usable on the request path; coalescing is done client-side instead.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+BATCH_WINDOW_SECONDS = int(os.getenv("AI_BATCH_WINDOW_MS", "20")) / 1000
+BATCH_MAX_SIZE = int(os.getenv("AI_BATCH_MAX_SIZE", "16"))
+BATCH_IDLE_SECONDS = int(os.getenv("AI_BATCH_IDLE_MS", "2")) / 1000
+
+_Item = Tuple[Any, str, Any, asyncio.Future]
+
+
+class GeminiBatcher:
+    """Queue Gemini generate_content_async calls and flush them in small batches"""
+
+    def __init__(
+        self,
+        max_batch_size: int = BATCH_MAX_SIZE,
+        flush_interval: float = BATCH_WINDOW_SECONDS,
+        idle_gap: float = BATCH_IDLE_SECONDS,
+    ):
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.idle_gap = idle_gap
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def submit(self, model: Any, prompt: str, generation_config: Any) -> Any:
+        """Enqueue a prompt and wait for its Gemini response.
+
+        Callers must use a fixed generation_config per prompt: requests are
+        coalesced on (model, prompt) only.
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((model, prompt, generation_config, future))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            batch: List[_Item] = [await self._queue.get()]
+            deadline = self._loop.time() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                # Keep the batch open only while requests keep arriving
+                timeout = min(self.idle_gap, deadline - self._loop.time())
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Flush in the background so the next window starts collecting immediately
+            task = self._loop.create_task(self._flush(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _flush(self, batch: List[_Item]) -> None:
+        groups: Dict[Tuple[int, str], List[_Item]] = {}
+        for item in batch:
+            groups.setdefault((id(item[0]), item[1]), []).append(item)
+        if len(groups) < len(batch):
+            logger.debug(f"Coalesced {len(batch)} Gemini requests into {len(groups)} calls")
+        await asyncio.gather(*(self._call(items) for items in groups.values()))
+
+    async def _call(self, items: List[_Item]) -> None:
+        model, prompt, generation_config, _ = items[0]
+        try:
+            # Native async client - no worker thread held for the Gemini round-trip
+            response = await model.generate_content_async(prompt, generation_config=generation_config)
+        except Exception as e:
+            for *_, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for *_, future in items:
+            if not future.done():
+                future.set_result(response)
@@ -0,0 +1,278 @@
+"""
+Cache backends for AI governance results.
+
+Gemini round-trips dominate AI endpoint latency, so results are cached:
+- RedisBackend: shared across workers/replicas and survives restarts (REDIS_URL)
+- InMemoryBackend: per-process fallback when Redis is not configured or unreachable
+- SemanticCache: optional embedding-similarity tier that also serves paraphrases
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List, Callable, NamedTuple, Sequence
+
+import orjson
+from cachetools import TLRUCache
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_TTL_SECONDS = int(os.getenv("AI_CACHE_TTL_SECONDS", "3600"))
+CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX", "10000"))
+CACHE_KEY_PREFIX = "aigov:ai:"
+
+SEMANTIC_CACHE_ENABLED = os.getenv("ENABLE_SEMANTIC_CACHE", "false").lower() == "true"
+SEMANTIC_CACHE_MODEL = os.getenv("SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.93"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "10000"))
+SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH")  # Directory to persist indexes
+SEMANTIC_CACHE_SAVE_EVERY = 25
+
+
+class CacheBackend(ABC):
+    """Async key/value cache with per-entry TTL"""
+
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Cached value for key, or None if missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: int = CACHE_TTL_SECONDS) -> None:
+        """Store value under key for ttl seconds"""
+
+    def size(self) -> Optional[int]:
+        """Number of cached entries, if cheaply known"""
+        return None
+
+
+class InMemoryBackend(CacheBackend):
+    """Per-process LRU cache bounded to AI_CACHE_MAX entries (lost on restart, not shared)"""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = CACHE_MAX_ENTRIES):
+        # Entries are (value, ttl); expiry is computed per entry on insert
+        self._cache = TLRUCache(maxsize=maxsize, ttu=lambda _key, entry, now: now + entry[1])
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._cache.get(key)
+        return entry[0] if entry is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int = CACHE_TTL_SECONDS) -> None:
+        self._cache[key] = (value, ttl)
+
+    def size(self) -> Optional[int]:
+        return len(self._cache)
+
+
+class RedisBackend(CacheBackend):
+    """Redis cache storing JSON-serialized values with SETEX semantics.
+
+    Any Redis error degrades to the in-memory fallback so a Redis outage
+    never turns into an AI endpoint failure.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis.asyncio as aioredis
+        self._redis = aioredis.Redis.from_url(url)
+        self._fallback = InMemoryBackend()
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self._redis.get(CACHE_KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"Redis cache read failed, using in-memory fallback: {e}")
+            return await self._fallback.get(key)
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int = CACHE_TTL_SECONDS) -> None:
+        try:
+            await self._redis.set(CACHE_KEY_PREFIX + key, orjson.dumps(value), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Redis cache write failed, using in-memory fallback: {e}")
+            await self._fallback.set(key, value, ttl)
+
+
+class SemanticHit(NamedTuple):
+    """A semantic cache entry and its remaining lifetime in seconds"""
+    value: Any
+    ttl: int
+
+
+class SemanticCache:
+    """Nearest-neighbour cache over input embeddings (HNSW, cosine space).
+
+    Only the variable user input is embedded - the fixed prompt rubric would
+    otherwise dominate similarity. Each namespace (e.g. "risk", "desc") gets
+    its own index so results never cross endpoints. Entries expire after
+    `ttl` seconds like the exact-match tier; expired slots are reused.
+    """
+
+    def __init__(
+        self,
+        model_name: str = SEMANTIC_CACHE_MODEL,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        path: Optional[str] = SEMANTIC_CACHE_PATH,
+        ttl: int = CACHE_TTL_SECONDS,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+    ):
+        import hnswlib
+
+        self._hnswlib = hnswlib
+        if embed is None:
+            from fastembed import TextEmbedding
+            self._embedder_cls = TextEmbedding
+        self._embed_fn = embed
+        self._embedder = None
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = path
+        self.ttl = ttl
+        self._indexes: Dict[str, Any] = {}
+        # Per namespace, indexed by HNSW label: [expires_at (epoch seconds), value]
+        self._stores: Dict[str, List[List[Any]]] = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+    def _embed(self, text: str):
+        text = text.strip().lower()
+        if self._embed_fn is not None:
+            return self._embed_fn(text)
+        if self._embedder is None:
+            self._embedder = self._embedder_cls(model_name=self.model_name)
+        return next(iter(self._embedder.embed([text])))
+
+    def _namespace(self, namespace: str, dim: int):
+        if namespace not in self._indexes:
+            # Dimension comes from the embedder output, so any model works
+            index = self._hnswlib.Index(space="cosine", dim=dim)
+            store = self._load(namespace, index, dim)
+            if store is None:
+                index.init_index(max_elements=self.max_entries, ef_construction=200, M=16)
+                store = []
+            self._indexes[namespace] = index
+            self._stores[namespace] = store
+        return self._indexes[namespace], self._stores[namespace]
+
+    def _load(self, namespace: str, index, dim: int) -> Optional[List[List[Any]]]:
+        """Persisted entries, unless missing or written for another embedding model"""
+        index_file = self._file(namespace, "bin")
+        if not index_file or not os.path.exists(index_file):
+            return None
+        with open(self._file(namespace, "json"), "rb") as f:
+            saved = orjson.loads(f.read())
+        if not isinstance(saved, dict) or saved.get("model") != self.model_name or saved.get("dim") != dim:
+            logger.info(f"Discarding semantic cache '{namespace}' saved for another embedding model")
+            return None
+        index.load_index(index_file, max_elements=self.max_entries)
+        return saved["entries"]
+
+    def _file(self, namespace: str, ext: str) -> Optional[str]:
+        return os.path.join(self.path, f"semantic_{namespace}.{ext}") if self.path else None
+
+    def _lookup(self, namespace: str, text: str) -> Optional[SemanticHit]:
+        vec = self._embed(text)
+        with self._lock:
+            index, store = self._namespace(namespace, len(vec))
+            try:
+                labels, dists = index.knn_query(vec, k=1)
+            except RuntimeError:
+                return None  # No live entries
+            label = int(labels[0][0])
+            expires_at, value = store[label]
+            remaining = int(expires_at - time.time())
+            if remaining <= 0:
+                # Hide it so the next nearest live entry can match; _add reuses the slot
+                index.mark_deleted(label)
+                return None
+        if 1 - dists[0][0] > self.threshold:
+            return SemanticHit(value, remaining)
+        return None
+
+    def _add(self, namespace: str, text: str, value: Any) -> None:
+        vec = self._embed(text)
+        entry = [time.time() + self.ttl, value]
+        with self._lock:
+            index, store = self._namespace(namespace, len(vec))
+            if len(store) < self.max_entries:
+                label = len(store)
+                store.append(entry)
+            else:
+                now = time.time()
+                label = next((i for i, (expires_at, _) in enumerate(store) if expires_at <= now), None)
+                if label is None:
+                    return  # Full of live entries - exact-match tier still serves new ones
+                store[label] = entry
+            # Re-adding an existing (possibly deleted) label replaces its vector
+            index.add_items(vec, label)
+            self._unsaved += 1
+            if self._unsaved >= SEMANTIC_CACHE_SAVE_EVERY:
+                self._save_locked()
+
+    def _save_locked(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        for namespace, index in self._indexes.items():
+            index.save_index(self._file(namespace, "bin"))
+            with open(self._file(namespace, "json"), "wb") as f:
+                f.write(orjson.dumps({
+                    "model": self.model_name,
+                    "dim": index.dim,
+                    "entries": self._stores[namespace],
+                }))
+        self._unsaved = 0
+
+    def save(self) -> None:
+        """Persist all indexes to SEMANTIC_CACHE_PATH (no-op if unset)"""
+        with self._lock:
+            self._save_locked()
+
+    async def get(self, namespace: str, text: str) -> Optional[SemanticHit]:
+        # Embedding and HNSW search are CPU work - keep them off the event loop
+        try:
+            return await asyncio.to_thread(self._lookup, namespace, text)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+    async def set(self, namespace: str, text: str, value: Any) -> None:
+        try:
+            await asyncio.to_thread(self._add, namespace, text, value)
+        except Exception as e:
+            logger.warning(f"Semantic cache write failed: {e}")
+
+
+def create_semantic_cache() -> Optional[SemanticCache]:
+    """Build the semantic tier if ENABLE_SEMANTIC_CACHE=true and deps are installed"""
+    if not SEMANTIC_CACHE_ENABLED:
+        return None
+    try:
+        cache = SemanticCache()
+        logger.info(f"Semantic AI cache enabled (threshold {SEMANTIC_CACHE_THRESHOLD})")
+        return cache
+    except ImportError:
+        logger.warning("hnswlib/fastembed not installed. Semantic AI cache disabled.")
+        return None
+
+
+def create_cache_backend() -> CacheBackend:
+    """Use Redis when REDIS_URL is set and the client is installed, else memory"""
+    if REDIS_URL:
+        try:
+            backend = RedisBackend(REDIS_URL)
+            logger.info("AI cache backend: redis")
+            return backend
+        except ImportError:
+            logger.warning("redis not installed. Falling back to in-memory AI cache.")
+    return InMemoryBackend()
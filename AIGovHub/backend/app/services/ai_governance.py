@@ -8,10 +8,24 @@ Provides intelligent governance assistance including:
 """
 
 import os
+import re
+import functools
+import importlib.util
 import json
+import time
+import asyncio
+import hashlib
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import timedelta
+from typing import Optional, Dict, Any, AsyncIterator, List
+
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import TypedDict
+
+from app.services.ai_cache import create_cache_backend, create_semantic_cache, CACHE_TTL_SECONDS
+from app.services.ai_batcher import GeminiBatcher
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -19,67 +33,47 @@ logger = logging.getLogger(__name__)
 AI_ENABLED = os.getenv("ENABLE_AI_FEATURES", "false").lower() == "true"
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")  # Latest Flash model by default
+# Upload static instructions once via Gemini context caching (needs a cache-capable model)
+GEMINI_CONTEXT_CACHE = os.getenv("GEMINI_CONTEXT_CACHE", "false").lower() == "true"
+CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL_SECONDS", "3600"))
+
+# Shared Redis cache when REDIS_URL is set, per-process memory otherwise
+_cache = create_cache_backend()
+# Optional embedding-similarity tier consulted after an exact-match miss
+_semantic_cache = create_semantic_cache()
 
-# Simple in-memory cache (in production, use Redis)
-_cache: Dict[str, tuple[Any, datetime]] = {}
-CACHE_TTL_SECONDS = int(os.getenv("AI_CACHE_TTL_SECONDS", "3600"))
+# Coalesces concurrent Gemini requests arriving within a short window
+_batcher = GeminiBatcher()
 
-# Only import if AI is enabled and key is available
+# google.generativeai is only imported on first use (see _genai), so
+# deployments with AI disabled never pay its import cost
 if AI_ENABLED and GEMINI_API_KEY:
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=GEMINI_API_KEY)
-        logger.info(f"AI features enabled with model: {GEMINI_MODEL}")
-    except ImportError:
+    if importlib.util.find_spec("google.generativeai") is None:
         logger.warning("google-generativeai not installed. AI features disabled.")
         AI_ENABLED = False
+    else:
+        logger.info(f"AI features enabled with model: {GEMINI_MODEL}")
 else:
     logger.info("AI features disabled (ENABLE_AI_FEATURES=false or no API key)")
 
 
-def _get_cached(key: str) -> Optional[Any]:
-    """Get cached result if not expired"""
-    if key in _cache:
-        result, expiry = _cache[key]
-        if datetime.now() < expiry:
-            return result
-        else:
-            del _cache[key]
-    return None
-
+@functools.cache
+def _genai():
+    """Import and configure the Gemini client once, on first use"""
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai
 
-def _set_cache(key: str, value: Any) -> None:
-    """Cache result with TTL"""
-    _cache[key] = (value, datetime.now() + timedelta(seconds=CACHE_TTL_SECONDS))
 
+@functools.cache
+def _default_model():
+    # One model wrapper shared by all requests (also lets the batcher coalesce)
+    return _genai().GenerativeModel(GEMINI_MODEL)
 
-async def assess_model_risk(
-    model_name: str,
-    description: str,
-    owner: str
-) -> Optional[Dict[str, Any]]:
-    """
-    Analyze model details and suggest appropriate EU AI Act risk classification.
-    
-    Returns None if AI is disabled or fails, allowing graceful degradation.
-    """
-    if not AI_ENABLED:
-        return None
-    
-    # Create cache key
-    cache_key = f"risk:{model_name}:{description[:50]}"
-    cached = _get_cached(cache_key)
-    if cached:
-        return cached
-    
-    try:
-        model = genai.GenerativeModel(GEMINI_MODEL)
-        
-        prompt = f"""Analyze this AI model and suggest an EU AI Act risk classification.
 
-Model Name: {model_name}
-Description: {description}
-Owner: {owner}
+# Static instruction prefixes, sent as system instructions so only the
+# variable model details travel in each request's contents.
+_RISK_INSTRUCTIONS = """Analyze the AI model described by the user and suggest an EU AI Act risk classification.
 
 EU AI Act Risk Levels:
 - unacceptable: Prohibited systems (social scoring, subliminal manipulation, real-time biometric surveillance)
@@ -94,46 +88,248 @@ Analyze based on:
 4. Safety-critical nature
 
 Return ONLY valid JSON in this exact format (no markdown, no explanation):
-{{
+{
   "suggested_risk": "high|limited|minimal|unacceptable",
   "reasoning": "Brief explanation why this classification applies",
   "eu_criteria": ["Relevant EU AI Act articles or considerations"],
   "recommendations": ["Specific actions to take for compliance"]
-}}"""
+}"""
 
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.3,  # Lower temperature for consistent results
-                max_output_tokens=500,
+_COMPLIANCE_INSTRUCTIONS_HEAD = """Review the AI model described by the user against these governance policies and identify compliance concerns.
+
+Active Governance Policies:
+"""
+
+_COMPLIANCE_INSTRUCTIONS_TAIL = """
+
+Analyze:
+1. Does this model violate any active policies?
+2. What compliance actions are required?
+3. What safeguards should be implemented?
+
+Return ONLY valid JSON (no markdown):
+{
+  "compliant": true|false,
+  "concerns": ["List of specific concerns or violations"],
+  "required_actions": ["Actions required for compliance"],
+  "recommendations": ["Suggested safeguards or improvements"]
+}"""
+
+# Per-request templates: only the variable parts are formatted in, static
+# JSON schemas are concatenated so their braces never pass through format()
+_RISK_PROMPT = "Model Name: {model_name}\nDescription: {description}\nOwner: {owner}"
+
+_POLICY_LINE = "- {name}: {description} (Scope: {scope}, Active: {is_active})"
+
+_COMPLIANCE_PROMPT = """Model Details:
+- Name: {name}
+- Description: {description}
+- Risk Level: {risk_level}
+- Status: {status}"""
+
+_DESCRIPTION_PROMPT_HEAD = """Analyze this AI model description for governance documentation quality.
+
+Description: {description}
+"""
+
+_DESCRIPTION_PROMPT_TAIL = """
+Evaluate:
+1. Completeness (use case, domain, capabilities)
+2. Clarity and specificity
+3. Compliance-relevant information
+4. Missing critical details
+
+Rate quality 1-10 and suggest improvements.
+
+Return ONLY valid JSON (no markdown):
+{
+  "quality_score": 1-10,
+  "strengths": ["What's good about this description"],
+  "weaknesses": ["What's missing or unclear"],
+  "suggestions": ["Specific improvements to make"],
+  "compliance_gaps": ["Governance information that should be added"]
+}"""
+
+# Models bound to a system instruction, keyed by instruction hash -> (model, expires_at)
+_instruction_models: Dict[str, tuple[Any, float]] = {}
+_MAX_INSTRUCTION_MODELS = 32
+
+
+def _build_instruction_model(instruction: str) -> tuple[Any, float]:
+    """Create a model for a static instruction, via context caching when enabled.
+
+    Context caching has a minimum token count and only works on versioned
+    models; if creation fails the instruction is sent inline instead.
+    """
+    if GEMINI_CONTEXT_CACHE:
+        try:
+            cached_content = _genai().caching.CachedContent.create(
+                model=GEMINI_MODEL,
+                system_instruction=instruction,
+                ttl=timedelta(seconds=CONTEXT_CACHE_TTL_SECONDS),
             )
+            # Rebuild a minute before Gemini expires the cached content
+            expires_at = time.monotonic() + CONTEXT_CACHE_TTL_SECONDS - 60
+            return _genai().GenerativeModel.from_cached_content(cached_content), expires_at
+        except Exception as e:
+            logger.warning(f"Gemini context cache unavailable, sending instructions inline: {e}")
+    return _genai().GenerativeModel(GEMINI_MODEL, system_instruction=instruction), float("inf")
+
+
+async def _model_for(instruction: str) -> Any:
+    """Get the (cached) model for a static instruction prefix"""
+    key = hashlib.blake2b(instruction.encode(), digest_size=16).hexdigest()
+    entry = _instruction_models.get(key)
+    if entry and time.monotonic() < entry[1]:
+        return entry[0]
+    # CachedContent.create is a blocking HTTP call
+    entry = await asyncio.to_thread(_build_instruction_model, instruction)
+    if len(_instruction_models) >= _MAX_INSTRUCTION_MODELS:
+        _instruction_models.clear()
+    _instruction_models[key] = entry
+    return entry[0]
+
+
+# Optional ```json fence around the whole response, leading and trailing
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*(?:```)?\s*$", re.DOTALL)
+
+
+def _extract_json(text: str) -> Any:
+    """Parse a Gemini JSON response, stripping a markdown code fence if present"""
+    match = _FENCE_RE.match(text)
+    return orjson.loads(match.group(1) if match else text)
+
+
+# Result shapes returned to the API (mirroring its response models). Gemini
+# output is validated against these once, before it is cached or returned.
+class RiskResult(TypedDict):
+    suggested_risk: str
+    reasoning: str
+    eu_criteria: List[str]
+    recommendations: List[str]
+
+
+class ComplianceResult(TypedDict):
+    compliant: bool
+    concerns: List[str]
+    required_actions: List[str]
+    recommendations: List[str]
+
+
+class DescriptionResult(TypedDict):
+    quality_score: int
+    strengths: List[str]
+    weaknesses: List[str]
+    suggestions: List[str]
+    compliance_gaps: List[str]
+
+
+_RISK_RESULT = TypeAdapter(RiskResult)
+_COMPLIANCE_RESULT = TypeAdapter(ComplianceResult)
+_DESCRIPTION_RESULT = TypeAdapter(DescriptionResult)
+VALID_RISKS = frozenset({"high", "limited", "minimal", "unacceptable"})
+
+
+def _validated(adapter: TypeAdapter, result: Any, kind: str) -> Optional[Dict[str, Any]]:
+    """Coerce a parsed Gemini response to its result shape, or None if it doesn't fit"""
+    try:
+        return adapter.validate_python(result)
+    except ValidationError as e:
+        logger.error(f"Invalid AI {kind} response: {e}")
+        return None
+
+
+def _key(prefix: str, *parts: str) -> str:
+    """Build a cache key from a BLAKE2b digest over the full, normalized inputs.
+
+    Hashing the whole input avoids false hits between inputs sharing a prefix;
+    normalizing case/whitespace lets trivially different inputs share an entry.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update((part or "").strip().lower().encode())
+        h.update(b"\x00")
+    return f"{prefix}:{h.hexdigest()}"
+
+
+def _risk_prompt(model_name: str, description: str, owner: str) -> str:
+    return _RISK_PROMPT.format(model_name=model_name, description=description, owner=owner)
+
+
+def _risk_generation_config():
+    return _genai().GenerationConfig(
+        temperature=0.3,  # Lower temperature for consistent results
+        max_output_tokens=500,
+    )
+
+
+def _validated_risk_result(result: Any) -> Optional[Dict[str, Any]]:
+    result = _validated(_RISK_RESULT, result, "risk assessment")
+    if result is None:
+        return None
+    
+    # Validate risk level
+    if result["suggested_risk"] not in VALID_RISKS:
+        logger.error(f"Invalid risk level: {result['suggested_risk']}")
+        return None
+    return result
+
+
+async def _cached_risk(cache_key: str, semantic_text: str) -> Optional[Dict[str, Any]]:
+    cached = await _cache.get(cache_key)
+    if cached:
+        return cached
+    
+    if _semantic_cache:
+        hit = await _semantic_cache.get("risk", semantic_text)
+        if hit:
+            # Re-seed the exact tier only for the entry's remaining lifetime
+            await _cache.set(cache_key, hit.value, ttl=hit.ttl)
+            return hit.value
+    return None
+
+
+async def _store_risk(cache_key: str, semantic_text: str, result: Dict[str, Any]) -> None:
+    await _cache.set(cache_key, result)
+    if _semantic_cache:
+        await _semantic_cache.set("risk", semantic_text, result)
+
+
+async def assess_model_risk(
+    model_name: str,
+    description: str,
+    owner: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Analyze model details and suggest appropriate EU AI Act risk classification.
+    
+    Returns None if AI is disabled or fails, allowing graceful degradation.
+    """
+    if not AI_ENABLED:
+        return None
+    
+    # Create cache key
+    cache_key = _key("risk", model_name, description, owner)
+    semantic_text = f"{model_name}\n{description}\n{owner}"
+    cached = await _cached_risk(cache_key, semantic_text)
+    if cached:
+        return cached
+    
+    try:
+        model = await _model_for(_RISK_INSTRUCTIONS)
+        response = await _batcher.submit(
+            model,
+            _risk_prompt(model_name, description, owner),
+            _risk_generation_config(),
         )
         
         # Parse JSON from response
-        text = response.text.strip()
-        # Remove markdown code blocks if present
-        if text.startswith("```"):
-            text = text.split("```")[1]
-            if text.startswith("json"):
-                text = text[4:]
-        text = text.strip()
-        
-        result = json.loads(text)
-        
-        # Validate result structure
-        required_keys = ["suggested_risk", "reasoning", "eu_criteria", "recommendations"]
-        if not all(k in result for k in required_keys):
-            logger.error(f"Invalid AI response structure: {result}")
-            return None
-        
-        # Validate risk level
-        valid_risks = ["high", "limited", "minimal", "unacceptable"]
-        if result["suggested_risk"] not in valid_risks:
-            logger.error(f"Invalid risk level: {result['suggested_risk']}")
+        result = _validated_risk_result(_extract_json(response.text))
+        if result is None:
             return None
         
         # Cache and return
-        _set_cache(cache_key, result)
+        await _store_risk(cache_key, semantic_text, result)
         return result
         
     except json.JSONDecodeError as e:
@@ -144,6 +340,53 @@ Return ONLY valid JSON in this exact format (no markdown, no explanation):
         return None
 
 
+async def stream_model_risk(
+    model_name: str,
+    description: str,
+    owner: str
+) -> AsyncIterator[bytes]:
+    """
+    Stream a risk assessment as NDJSON lines.
+    
+    Emits {"delta": text} for each Gemini chunk as it arrives, then a final
+    {"result": {...}} once the buffered response is parsed, validated and
+    cached, or {"error": "..."} if it could not be. Cache hits emit only the
+    result line.
+    """
+    cache_key = _key("risk", model_name, description, owner)
+    semantic_text = f"{model_name}\n{description}\n{owner}"
+    cached = await _cached_risk(cache_key, semantic_text)
+    if cached:
+        yield orjson.dumps({"result": cached}) + b"\n"
+        return
+    
+    chunks: list[str] = []
+    try:
+        model = await _model_for(_RISK_INSTRUCTIONS)
+        # Streams can't be shared, so this path bypasses the batcher
+        response = await model.generate_content_async(
+            _risk_prompt(model_name, description, owner),
+            generation_config=_risk_generation_config(),
+            stream=True,
+        )
+        async for chunk in response:
+            chunks.append(chunk.text)
+            yield orjson.dumps({"delta": chunk.text}) + b"\n"
+        
+        result = _extract_json("".join(chunks))
+    except Exception as e:
+        logger.error(f"AI risk assessment stream failed: {e}")
+        yield orjson.dumps({"error": "AI risk assessment failed"}) + b"\n"
+        return
+    
+    result = _validated_risk_result(result)
+    if result is None:
+        yield orjson.dumps({"error": "Invalid AI response"}) + b"\n"
+        return
+    await _store_risk(cache_key, semantic_text, result)
+    yield orjson.dumps({"result": result}) + b"\n"
+
+
 async def check_policy_compliance(
     model_data: Dict[str, Any],
     policies: list[Dict[str, Any]]
@@ -156,62 +399,50 @@ async def check_policy_compliance(
     if not AI_ENABLED or not policies:
         return None
     
+    # Summarize policies for prompt, in a stable order so the same active
+    # set always yields the same instruction text and cache key
+    policy_summary = "\n".join([
+        _POLICY_LINE.format(
+            name=p['name'],
+            description=p.get('description', 'No description'),
+            scope=p['scope'],
+            is_active=p['is_active'],
+        )
+        for p in sorted(policies, key=lambda p: p['name'])
+    ])
+    prompt = _COMPLIANCE_PROMPT.format(
+        name=model_data.get('name'),
+        description=model_data.get('description', 'Not provided'),
+        risk_level=model_data.get('risk_level', 'Unclassified'),
+        status=model_data.get('compliance_status', 'Draft'),
+    )
+    
+    # Keyed on the policy set as well as the model, so any policy change
+    # (added, edited or deactivated) invalidates earlier results
+    cache_key = _key("comp", policy_summary, prompt)
+    cached = await _cache.get(cache_key)
+    if cached:
+        return cached
+    
     try:
-        model = genai.GenerativeModel(GEMINI_MODEL)
-        
-        # Summarize policies for prompt
-        policy_summary = "\n".join([
-            f"- {p['name']}: {p.get('description', 'No description')} (Scope: {p['scope']}, Active: {p['is_active']})"
-            for p in policies
-        ])
-        
-        prompt = f"""Review this AI model against governance policies and identify compliance concerns.
-
-Model Details:
-- Name: {model_data.get('name')}
-- Description: {model_data.get('description', 'Not provided')}
-- Risk Level: {model_data.get('risk_level', 'Unclassified')}
-- Status: {model_data.get('compliance_status', 'Draft')}
-
-Active Governance Policies:
-{policy_summary}
+        # The policy list is static until the active set changes - it goes in the
+        # (cached) instruction prefix, keyed by its hash
+        model = await _model_for(_COMPLIANCE_INSTRUCTIONS_HEAD + policy_summary + _COMPLIANCE_INSTRUCTIONS_TAIL)
 
-Analyze:
-1. Does this model violate any active policies?
-2. What compliance actions are required?
-3. What safeguards should be implemented?
-
-Return ONLY valid JSON (no markdown):
-{{
-  "compliant": true|false,
-  "concerns": ["List of specific concerns or violations"],
-  "required_actions": ["Actions required for compliance"],
-  "recommendations": ["Suggested safeguards or improvements"]
-}}"""
-
-        response = model.generate_content(
+        response = await _batcher.submit(
+            model,
             prompt,
-            generation_config=genai.GenerationConfig(
+            _genai().GenerationConfig(
                 temperature=0.3,
                 max_output_tokens=600,
             )
         )
         
-        text = response.text.strip()
-        if text.startswith("```"):
-            text = text.split("```")[1]
-            if text.startswith("json"):
-                text = text[4:]
-        text = text.strip()
-        
-        result = json.loads(text)
-        
-        # Validate structure
-        required_keys = ["compliant", "concerns", "required_actions", "recommendations"]
-        if not all(k in result for k in required_keys):
-            logger.error(f"Invalid compliance check response: {result}")
+        result = _validated(_COMPLIANCE_RESULT, _extract_json(response.text), "compliance check")
+        if result is None:
             return None
         
+        await _cache.set(cache_key, result)
         return result
         
     except Exception as e:
@@ -230,58 +461,39 @@ async def suggest_description_improvements(
     if not AI_ENABLED or not description:
         return None
     
-    cache_key = f"desc:{description[:100]}"
-    cached = _get_cached(cache_key)
+    cache_key = _key("desc", description)
+    cached = await _cache.get(cache_key)
     if cached:
         return cached
     
+    if _semantic_cache:
+        hit = await _semantic_cache.get("desc", description)
+        if hit:
+            await _cache.set(cache_key, hit.value, ttl=hit.ttl)
+            return hit.value
+    
     try:
-        model = genai.GenerativeModel(GEMINI_MODEL)
+        model = _default_model()
         
-        prompt = f"""Analyze this AI model description for governance documentation quality.
+        prompt = _DESCRIPTION_PROMPT_HEAD.format(description=description) + _DESCRIPTION_PROMPT_TAIL
 
-Description: {description}
-
-Evaluate:
-1. Completeness (use case, domain, capabilities)
-2. Clarity and specificity
-3. Compliance-relevant information
-4. Missing critical details
-
-Rate quality 1-10 and suggest improvements.
-
-Return ONLY valid JSON (no markdown):
-{{
-  "quality_score": 1-10,
-  "strengths": ["What's good about this description"],
-  "weaknesses": ["What's missing or unclear"],
-  "suggestions": ["Specific improvements to make"],
-  "compliance_gaps": ["Governance information that should be added"]
-}}"""
-
-        response = model.generate_content(
+        response = await _batcher.submit(
+            model,
             prompt,
-            generation_config=genai.GenerationConfig(
+            _genai().GenerationConfig(
                 temperature=0.4,
                 max_output_tokens=500,
             )
         )
         
-        text = response.text.strip()
-        if text.startswith("```"):
-            text = text.split("```")[1]
-            if text.startswith("json"):
-                text = text[4:]
-        text = text.strip()
-        
-        result = json.loads(text)
-        
-        # Validate and cache
-        if "quality_score" in result and "suggestions" in result:
-            _set_cache(cache_key, result)
-            return result
+        result = _validated(_DESCRIPTION_RESULT, _extract_json(response.text), "description analysis")
+        if result is None:
+            return None
         
-        return None
+        await _cache.set(cache_key, result)
+        if _semantic_cache:
+            await _semantic_cache.set("desc", description, result)
+        return result
         
     except Exception as e:
         logger.error(f"AI description analysis failed: {e}")
@@ -293,11 +505,19 @@ def is_ai_enabled() -> bool:
     return AI_ENABLED and GEMINI_API_KEY is not None
 
 
+def save_caches() -> None:
+    """Persist the semantic cache index (called on application shutdown)"""
+    if _semantic_cache:
+        _semantic_cache.save()
+
+
 def get_ai_config() -> Dict[str, Any]:
     """Get current AI configuration (for diagnostics)"""
     return {
         "enabled": is_ai_enabled(),
         "model": GEMINI_MODEL if is_ai_enabled() else None,
         "cache_ttl": CACHE_TTL_SECONDS,
-        "cache_size": len(_cache)
+        "cache_backend": _cache.name,
+        "cache_size": _cache.size(),
+        "semantic_cache": _semantic_cache is not None
     }
@@ -0,0 +1,86 @@
+"""
+Tests for the Gemini request coalescer.
+"""
+import asyncio
+import pytest
+from app.services.ai_batcher import GeminiBatcher
+
+
+class FakeModel:
+    """Stand-in for genai.GenerativeModel that counts calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        self.calls.append(prompt)
+        return f"response:{prompt}"
+
+
+def test_identical_prompts_are_coalesced():
+    """Test concurrent identical prompts share a single Gemini call."""
+    model = FakeModel()
+    batcher = GeminiBatcher(flush_interval=0.05)
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.submit(model, "same prompt", None) for _ in range(5)),
+            batcher.submit(model, "other prompt", None),
+        )
+
+    results = asyncio.run(run())
+    assert results[:5] == ["response:same prompt"] * 5
+    assert results[5] == "response:other prompt"
+    assert sorted(model.calls) == ["other prompt", "same prompt"]
+
+
+def test_errors_propagate_to_all_waiters():
+    """Test a failed Gemini call raises for every coalesced request."""
+    class FailingModel:
+        async def generate_content_async(self, prompt, generation_config=None):
+            raise RuntimeError("quota exceeded")
+
+    model = FailingModel()
+    batcher = GeminiBatcher(flush_interval=0.01)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit(model, "p", None),
+            batcher.submit(model, "p", None),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_lone_request_does_not_wait_for_the_window():
+    """Test a request with nothing else arriving is dispatched after the idle gap."""
+    model = FakeModel()
+    batcher = GeminiBatcher(flush_interval=1.0, idle_gap=0.005)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await batcher.submit(model, "p", None)
+        return result, loop.time() - start
+
+    result, elapsed = asyncio.run(run())
+    assert result == "response:p"
+    assert elapsed < 0.5
+
+
+def test_batch_stays_open_while_requests_keep_arriving():
+    """Test requests spaced under the idle gap still coalesce."""
+    model = FakeModel()
+    batcher = GeminiBatcher(flush_interval=1.0, idle_gap=0.2)
+
+    async def late_submit():
+        await asyncio.sleep(0.02)
+        return await batcher.submit(model, "p", None)
+
+    async def run():
+        return await asyncio.gather(batcher.submit(model, "p", None), late_submit())
+
+    assert asyncio.run(run()) == ["response:p", "response:p"]
+    assert model.calls == ["p"]
@@ -0,0 +1,141 @@
+"""
+Tests for AI result cache backends.
+"""
+import asyncio
+import pytest
+from app.services.ai_cache import InMemoryBackend, create_cache_backend
+
+
+def test_in_memory_backend_roundtrip():
+    """Test values are returned until their TTL expires."""
+    cache = InMemoryBackend()
+    asyncio.run(cache.set("risk:key", {"suggested_risk": "high"}, ttl=60))
+    assert asyncio.run(cache.get("risk:key")) == {"suggested_risk": "high"}
+    assert cache.size() == 1
+
+
+def test_in_memory_backend_expiry():
+    """Test expired entries are not returned."""
+    cache = InMemoryBackend()
+    asyncio.run(cache.set("risk:key", {"suggested_risk": "high"}, ttl=-1))
+    assert asyncio.run(cache.get("risk:key")) is None
+    assert asyncio.run(cache.get("missing")) is None
+
+
+def test_default_backend_without_redis_url():
+    """Test the in-memory backend is used when REDIS_URL is not set."""
+    assert create_cache_backend().name == "memory"
+
+
+def test_cache_key_uses_full_normalized_input():
+    """Test cache keys distinguish long shared prefixes but ignore case/whitespace."""
+    from app.services.ai_governance import _key
+
+    prefix = "x" * 100
+    assert _key("desc", prefix + "a") != _key("desc", prefix + "b")
+    assert _key("desc", "  Loan Default Model ") == _key("desc", "loan default model")
+    assert _key("risk", "m", "d", "owner-a") != _key("risk", "m", "d", "owner-b")
+
+
+def test_extract_json_strips_fences():
+    """Test fenced and bare Gemini responses parse to the same JSON."""
+    from app.services.ai_governance import _extract_json
+    expected = {"suggested_risk": "high"}
+    assert _extract_json('{"suggested_risk": "high"}') == expected
+    assert _extract_json('```json\n{"suggested_risk": "high"}\n```') == expected
+    assert _extract_json('  ```\n{"suggested_risk": "high"}\n```  \n') == expected
+    assert _extract_json('```json\n{"suggested_risk": "high"}') == expected
+
+
+def test_in_memory_backend_is_bounded():
+    """Test the least recently used entry is evicted at capacity."""
+    cache = InMemoryBackend(maxsize=2)
+    asyncio.run(cache.set("a", 1))
+    asyncio.run(cache.set("b", 2))
+    asyncio.run(cache.get("a"))
+    asyncio.run(cache.set("c", 3))
+    assert cache.size() == 2
+    assert asyncio.run(cache.get("b")) is None
+    assert asyncio.run(cache.get("a")) == 1
+
+
+def test_ai_results_are_validated_before_caching():
+    """Test mistyped Gemini fields are rejected rather than passed to clients."""
+    from app.services.ai_governance import _validated, _COMPLIANCE_RESULT, _DESCRIPTION_RESULT
+
+    description = {
+        "quality_score": 7, "strengths": ["clear"], "weaknesses": [],
+        "suggestions": ["add data sources"], "compliance_gaps": [], "extra": "dropped",
+    }
+    assert _validated(_DESCRIPTION_RESULT, description, "description") == {
+        k: v for k, v in description.items() if k != "extra"
+    }
+    assert _validated(_DESCRIPTION_RESULT, {**description, "quality_score": "7/10"}, "description") is None
+    compliance = {"compliant": True, "concerns": "none", "required_actions": [], "recommendations": []}
+    assert _validated(_COMPLIANCE_RESULT, compliance, "compliance") is None
+    assert _validated(_COMPLIANCE_RESULT, ["not", "a", "dict"], "compliance") is None
+
+
+def _stub_embed(text):
+    """3-dimensional embeddings: 'loan' texts point one way, everything else another"""
+    if "loan" in text:
+        return [1.0, 0.1 if "default" in text else 0.0, 0.0]
+    return [0.0, 0.0, 1.0]
+
+
+def test_semantic_cache_threshold_hit_and_miss():
+    """Test close paraphrases hit, unrelated inputs miss, and the hit carries its TTL."""
+    pytest.importorskip("hnswlib")
+    from app.services.ai_cache import SemanticCache
+
+    cache = SemanticCache(threshold=0.9, ttl=60, embed=_stub_embed)
+    assert asyncio.run(cache.get("desc", "loan model")) is None
+    asyncio.run(cache.set("desc", "Loan model", {"quality_score": 7}))
+
+    hit = asyncio.run(cache.get("desc", "loan default model"))
+    assert hit.value == {"quality_score": 7}
+    assert 0 < hit.ttl <= 60
+    assert asyncio.run(cache.get("desc", "image classifier")) is None
+    assert asyncio.run(cache.get("risk", "loan model")) is None
+
+
+def test_semantic_cache_entries_expire_and_free_their_slot():
+    """Test expired entries miss and are replaced once the index is full."""
+    pytest.importorskip("hnswlib")
+    from app.services.ai_cache import SemanticCache
+
+    cache = SemanticCache(threshold=0.9, ttl=-1, max_entries=1, embed=_stub_embed)
+    asyncio.run(cache.set("desc", "loan model", {"stale": True}))
+    assert asyncio.run(cache.get("desc", "loan model")) is None
+
+    cache.ttl = 60
+    asyncio.run(cache.set("desc", "image classifier", {"fresh": True}))
+    assert asyncio.run(cache.get("desc", "image classifier")).value == {"fresh": True}
+    assert asyncio.run(cache.get("desc", "loan model")) is None
+
+
+def test_semantic_cache_ignores_index_saved_for_another_model(tmp_path):
+    """Test persisted indexes reload for the same embedding model only."""
+    pytest.importorskip("hnswlib")
+    from app.services.ai_cache import SemanticCache
+
+    cache = SemanticCache(model_name="a", threshold=0.9, path=str(tmp_path), embed=_stub_embed)
+    asyncio.run(cache.set("desc", "loan model", {"quality_score": 7}))
+    cache.save()
+
+    same = SemanticCache(model_name="a", threshold=0.9, path=str(tmp_path), embed=_stub_embed)
+    assert asyncio.run(same.get("desc", "loan model")).value == {"quality_score": 7}
+    other = SemanticCache(model_name="b", threshold=0.9, path=str(tmp_path), embed=_stub_embed)
+    assert asyncio.run(other.get("desc", "loan model")) is None
+
+
+def test_incomplete_cache_backend_fails_on_creation():
+    """Test a backend missing get/set cannot be instantiated."""
+    from app.services.ai_cache import CacheBackend
+
+    class GetOnly(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
@@ -1,6 +1,7 @@
 """
 Tests for policy engine and enforcement.
 """
+import asyncio
 import pytest
 from app.models.policy import Policy, PolicyViolation, PolicyScope, PolicyConditionType
 from app.schemas import ComplianceStatusUpdate
@@ -47,3 +48,85 @@ def test_policy_condition_type_enum():
     assert PolicyConditionType.require_evaluation_before_approval.value == "require_evaluation_before_approval"
     assert PolicyConditionType.block_high_risk_without_approval.value == "block_high_risk_without_approval"
     assert PolicyConditionType.require_review_for_high_risk.value == "require_review_for_high_risk"
+
+
+def test_active_policies_are_cached_until_invalidated():
+    """Test active policies are queried once per TTL and refetched after a policy write."""
+    from app.core import policy_engine
+
+    class FakeResult:
+        def all(self):
+            return [Policy(name="P", condition_type=PolicyConditionType.require_review_for_high_risk)]
+
+    class FakeSession:
+        def __init__(self):
+            self.queries = 0
+
+        async def exec(self, query):
+            self.queries += 1
+            return FakeResult()
+
+    session = FakeSession()
+    policy_engine.invalidate_policy_cache()
+    asyncio.run(policy_engine.get_active_policies(session))
+    policies = asyncio.run(policy_engine.get_active_policies(session))
+    assert session.queries == 1
+    assert policies[0].name == "P"
+
+    policy_engine.invalidate_policy_cache()
+    asyncio.run(policy_engine.get_active_policies(session))
+    assert session.queries == 2
+
+
+def test_enforcement_runs_each_condition_once():
+    """Test policies sharing a condition type trigger a single check."""
+    from app.core import policy_engine
+    from app.models import ModelRegistry, ComplianceStatus
+
+    calls = []
+
+    async def fake_check(session, model, new_status):
+        calls.append(new_status)
+        return True
+
+    condition = PolicyConditionType.require_evaluation_before_approval
+    policies = [Policy(id=i, name=f"P{i}", condition_type=condition) for i in range(3)]
+    policy_engine._policy_cache[None] = (float("inf"), policies)
+    original = policy_engine.POLICY_CHECKS[condition]
+    policy_engine.POLICY_CHECKS[condition] = fake_check
+    try:
+        model = ModelRegistry(id=1, name="m", owner="o")
+        result = asyncio.run(policy_engine.enforce_compliance_status_change(
+            None, model, ComplianceStatus.approved
+        ))
+    finally:
+        policy_engine.POLICY_CHECKS[condition] = original
+        policy_engine.invalidate_policy_cache()
+    assert result.allowed
+    assert calls == [ComplianceStatus.approved]
+
+
+def test_blocked_status_change_records_status_columns():
+    """Test a blocked status change stores the status pair as columns, not details keys."""
+    from app.core import policy_engine
+    from app.models import ModelRegistry, ComplianceStatus, RiskLevel
+
+    class FakeSession:
+        def add_all(self, objects):
+            self.added = objects
+
+    session = FakeSession()
+    condition = PolicyConditionType.block_high_risk_without_approval
+    policy_engine._policy_cache[None] = (float("inf"), [Policy(id=1, name="P", condition_type=condition)])
+    try:
+        model = ModelRegistry(id=1, name="m", owner="o", risk_level=RiskLevel.high)
+        result = asyncio.run(policy_engine.enforce_compliance_status_change(
+            session, model, ComplianceStatus.approved
+        ))
+    finally:
+        policy_engine.invalidate_policy_cache()
+    assert not result.allowed
+    assert result.violation.attempted_status == ComplianceStatus.approved
+    assert result.violation.current_status == ComplianceStatus.draft
+    assert "attempted_status" not in result.violation.details
+    assert result.violation in session.added
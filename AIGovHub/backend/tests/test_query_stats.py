@@ -0,0 +1,50 @@
+"""
+Tests for per-route SQL statement counting.
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+def test_unmatched_requests_share_one_route_entry():
+    """Test 404/405 requests are bucketed together instead of keyed by raw path."""
+    from app.core import query_stats
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        return {"id": item_id}
+
+    app.add_middleware(query_stats.QueryCountMiddleware, emit_header=True)
+    query_stats.route_stats.clear()
+    client = TestClient(app)
+
+    for i in range(20):
+        assert client.get(f"/scan-{i}").status_code == 404
+    assert client.delete("/items/1").status_code == 405
+    assert client.get("/items/1").headers["x-query-count"] == "0"
+    client.get("/items/2")
+
+    assert query_stats.route_stats[query_stats.UNMATCHED_ROUTE]["requests"] == 21
+    assert query_stats.route_stats["GET /items/{item_id}"]["requests"] == 2
+    assert len(query_stats.route_stats) == 2
+    query_stats.route_stats.clear()
+
+
+def test_query_count_header_is_off_by_default():
+    """Test X-Query-Count is only sent when enabled (DEBUG), while counting continues."""
+    from app.core import query_stats
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {}
+
+    app.add_middleware(query_stats.QueryCountMiddleware)
+    query_stats.route_stats.clear()
+
+    response = TestClient(app).get("/ping")
+    assert "x-query-count" not in response.headers
+    assert query_stats.route_stats["GET /ping"]["requests"] == 1
+    query_stats.route_stats.clear()
@@ -0,0 +1,25 @@
+"""
+Tests for compliance report rendering.
+"""
+import time
+from datetime import datetime
+
+from app.core.reports import (
+    ModelRow, VersionRow, MetricRow, LogRow, generate_compliance_report_bytes
+)
+
+
+def test_report_bytes_depend_only_on_rows():
+    """Test identical rows render identical PDFs, so cached reports are never stale."""
+    model = ModelRow(1, "Loan Default", "risk-team", None, datetime(2024, 1, 1))
+    versions = [VersionRow(1, "v1", None, datetime(2024, 1, 2))]
+    metrics = [MetricRow(1, "auc", 0.91, datetime(2024, 1, 3))]
+    logs = [LogRow(1, "CREATE", "ModelRegistry", "1", datetime(2024, 1, 1))]
+
+    first = generate_compliance_report_bytes(model, versions, metrics, logs)
+    time.sleep(1.1)  # a wall-clock stamp would change between renders
+    assert generate_compliance_report_bytes(model, versions, metrics, logs) == first
+    assert first.startswith(b"%PDF")
+
+    newer_metrics = [MetricRow(2, "auc", 0.93, datetime(2024, 1, 4)), *metrics]
+    assert generate_compliance_report_bytes(model, versions, newer_metrics, logs) != first
@@ -36,3 +36,16 @@ def test_version_create_schema():
     version = VersionCreate(model_id=1, version_tag="v1.0.0", s3_path="s3://bucket/model")
     assert version.model_id == 1
     assert version.version_tag == "v1.0.0"
+
+
+def test_version_list_adapter_encodes_orm_rows():
+    """Test list adapters validate ORM instances and dump JSON directly."""
+    import json
+    from app.models import ModelVersion
+    from app.schemas import VERSION_READ_LIST
+
+    rows = [ModelVersion(id=1, model_id=2, version_tag="v1", s3_path=None)]
+    items = VERSION_READ_LIST.validate_python(rows, from_attributes=True)
+    encoded = json.loads(VERSION_READ_LIST.dump_json(items))
+    assert encoded[0]["version_tag"] == "v1"
+    assert encoded[0]["model_id"] == 2
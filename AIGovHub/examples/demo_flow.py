@@ -66,8 +66,11 @@ async def run_demo():
             print("   Make sure 'docker compose up' is running!")
             sys.exit(1)
         
-        # 2. Register a High-Risk Model
+        # 2-4. Register a High-Risk Model, a Sensitive Dataset and a Policy.
+        # These are independent, so they are created concurrently.
         print("\n[2] Registering 'Credit Risk Scoring v1' Model...")
+        print("[3] Registering 'Customer Transaction Data 2024' Dataset...")
+        print("[4] Creating Policy: 'Block Unapproved High Risk'...")
         model_payload = {
             "name": f"Credit Risk Scoring {datetime.now().strftime('%H%M%S')}",
             "owner": "Finance-Risk-Team",
@@ -78,29 +81,64 @@ async def run_demo():
             "data_classification": "confidential",
             "monitor_plan": "Monthly drift checks"
         }
-        resp = await client.post("/models/", json=model_payload)
-        if resp.status_code not in [200, 201]:
-            print(f"   ❌ Failed: {resp.text}")
-            return
-        model = resp.json()
-        model_id = model['id']
-        print(f"   ✅ Created Model ID {model_id}: {model['name']}")
-
-        # 3. Register a Sensitive Dataset
-        print("\n[3] Registering 'Customer Transaction Data 2024' Dataset...")
         dataset_payload = {
             "name": "Customer Transactions 2024",
             "source_system": "DataLake_Finance",
             "data_sensitivity": "pii",
             "data_classification": "restricted"
         }
-        resp = await client.post("/datasets/", json=dataset_payload)
-        dataset = resp.json()
+        policy_payload = {
+            "name": f"High Risk Guardrail {datetime.now().strftime('%H%M')}",
+            "description": "Blocks deployment of high-risk models without human approval",
+            "scope": "global",
+            "condition_type": "block_high_risk_without_approval",
+            "is_active": True
+        }
+        model_resp, dataset_resp, policy_resp = await asyncio.gather(
+            client.post("/models/", json=model_payload),
+            client.post("/datasets/", json=dataset_payload),
+            client.post("/policies/", json=policy_payload),
+        )
+
+        if model_resp.status_code not in [200, 201]:
+            print(f"   ❌ Model registration failed: {model_resp.text}")
+            return
+        model = model_resp.json()
+        model_id = model['id']
+        print(f"   ✅ Created Model ID {model_id}: {model['name']}")
+
+        dataset = dataset_resp.json()
         dataset_id = dataset['id']
         print(f"   ✅ Created Dataset ID {dataset_id}: {dataset['name']} ({dataset['data_sensitivity']})")
 
-        # 4. Link Dataset to Model (Lineage)
-        print("\n[4] Linking Dataset to Model...")
+        if policy_resp.status_code in [200, 201]:
+             print(f"   ✅ Policy Created: {policy_resp.json()['name']}")
+        else:
+             print(f"   ⚠️ Could not create policy (might already exist): {policy_resp.status_code}")
+
+        # 4b. Optional AI review (risk, compliance and description in one call)
+        print("\n[4b] Requesting AI governance analysis...")
+        resp = await client.post("/ai/analyze-all", json={
+            "model_name": model_payload["name"],
+            "description": model_payload["description"],
+            "owner": model_payload["owner"],
+            "risk_level": model_payload["risk_level"],
+        })
+        if resp.status_code == 200:
+            analysis = resp.json()
+            if analysis.get("risk"):
+                print(f"   ✅ Suggested risk: {analysis['risk']['suggested_risk']}")
+            if analysis.get("compliance"):
+                print(f"   ✅ Compliant: {analysis['compliance']['compliant']}")
+            if analysis.get("description"):
+                print(f"   ✅ Description quality: {analysis['description']['quality_score']}/10")
+        elif resp.status_code == 503:
+            print("   ⏭️  AI features disabled, skipping")
+        else:
+            print(f"   ⚠️ AI analysis failed: {resp.status_code}")
+
+        # 5. Link Dataset to Model (Lineage) - needs both IDs
+        print("\n[5] Linking Dataset to Model...")
         link_payload = {
             "dataset_id": dataset_id,
             "dataset_type": "training"
@@ -108,23 +146,6 @@ async def run_demo():
         resp = await client.post(f"/models/{model_id}/datasets/", json=link_payload)
         print("   ✅ Lineage Established")
 
-        # 5. Create a Policy (Block High Risk without Approval)
-        print("\n[5] Creating Policy: 'Block Unapproved High Risk'...")
-        policy_payload = {
-            "name": f"High Risk Guardrail {datetime.now().strftime('%H%M')}",
-            "description": "Blocks deployment of high-risk models without human approval",
-            "scope": "global",
-            "condition_type": "block_high_risk_without_approval",
-            "is_active": True
-        }
-        # Note: Policy endpoint might differ slightly based on implementation, adjusting if needed
-        # Assuming /policies/ based on previous browsing
-        resp = await client.post("/policies/", json=policy_payload)
-        if resp.status_code in [200, 201]:
-             print(f"   ✅ Policy Created: {resp.json()['name']}")
-        else:
-             print(f"   ⚠️ Could not create policy (might already exist): {resp.status_code}")
-
         # 6. Attempt Invalid Status Change (Simulating Policy Violation)
         print("\n[6] Attempting to approve model WITHOUT missing notes...")
         # Assuming we try to set to 'approved' directly
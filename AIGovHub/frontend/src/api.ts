@@ -3,7 +3,7 @@ import type {
   ModelRegistry,
   ModelVersion,
   EvaluationMetric,
-  ComplianceLog,
+  AuditLogPage,
 } from "./types";
 
 // Detect if running in GitHub Codespaces and construct the API URL accordingly
@@ -65,7 +65,10 @@ export const addMetric = async (
   return response.data;
 };
 
-export const getAuditLogs = async () => {
-  const response = await api.get<ComplianceLog[]>("/audit-logs/");
+// Pass the previous page's next_cursor to fetch the next (older) page
+export const getAuditLogs = async (cursor?: string) => {
+  const response = await api.get<AuditLogPage>("/audit-logs/", {
+    params: cursor ? { cursor } : undefined,
+  });
   return response.data;
 };
@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
-import type { PolicyViolation } from "../types";
+import type { PolicyViolationSummary } from "../types";
 import { getApiUrl } from "../lib/apiUrl";
 import {
   Card,
@@ -22,7 +22,7 @@ import {
 import { AlertCircle, ShieldAlert, Clock, ExternalLink } from "lucide-react";
 
 export function PolicyViolations() {
-  const [violations, setViolations] = useState<PolicyViolation[]>([]);
+  const [violations, setViolations] = useState<PolicyViolationSummary[]>([]);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -144,7 +144,7 @@ export function PolicyViolations() {
                       </Badge>
                     </TableCell>
                     <TableCell className="text-sm text-muted-foreground">
-                      {(v.details?.policy_name as string) || "Unknown Policy"}
+                      {v.policy_name}
                     </TableCell>
                     <TableCell>
                       <div className="flex items-center gap-1 text-sm text-muted-foreground">
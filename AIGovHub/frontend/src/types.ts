@@ -79,6 +79,11 @@ export interface ComplianceLog {
   timestamp: string;
 }
 
+export interface AuditLogPage {
+  items: ComplianceLog[];
+  next_cursor: string | null;
+}
+
 export interface DashboardStats {
   total_models: number;
   total_versions: number;
@@ -105,10 +110,23 @@ export interface PolicyViolation {
   model_version_id?: number;
   user_id?: number;
   action: string;
+  attempted_status?: ComplianceStatus;
+  current_status?: ComplianceStatus;
   details?: Record<string, unknown>;
   created_at: string;
 }
 
+export interface PolicyViolationSummary {
+  id: number;
+  policy_id: number;
+  policy_name: string;
+  model_id?: number;
+  action: string;
+  attempted_status?: ComplianceStatus;
+  current_status?: ComplianceStatus;
+  created_at: string;
+}
+
 export interface Organization {
   id: number;
   name: string;